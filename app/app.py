@@ -1,23 +1,42 @@
-from flask import Flask, request, jsonify
+import logging
+import os
+import time
+
+# Waktu import dicatat untuk laporan startup (lihat loader/warmup.py)
+_import_started = time.perf_counter()
+
+from flask import Flask, Response, request, jsonify
 from loader.load_ac import predict_energy_consumption as predict_energy_ac
 from loader.load_tv import predict_tv_energy_consumption as predict_energy_tv
-import pandas as pd
+from loader.batch import MAX_BATCH_SIZE, parse_records, predict_batch
+from loader.household import predict_household
+from loader.house_price import get_model as get_house_price_model
+from loader.metrics import METRICS_ENABLED, instrument_route, render_metrics, timed
+from loader.warmup import prewarm
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
 
 app = Flask(__name__)
+app.config['MAX_BATCH_SIZE'] = MAX_BATCH_SIZE
+app.config['STARTUP_REPORT'] = None
+
+# Membaca body JSON dari request
+@timed('parse_json')
+def read_json():
+    return request.json
 
 # Route untuk prediksi konsumsi energi tahunan untuk televisi
 @app.route('/predict-tv', methods=['POST'])
+@instrument_route('/predict-tv')
 def predict_tv():
     # Mengambil input JSON dari POST request
-    input_data = request.json
+    input_data = read_json()
     
     if isinstance(input_data, dict):  # Memastikan input_data adalah dictionary
-        # Konversi input data ke dalam DataFrame
-        input_df = pd.DataFrame([input_data])  # Membuat DataFrame dari dictionary input_data
-        
         # Lakukan prediksi konsumsi energi tahunan untuk televisi
+        # (input disusun langsung sesuai skema fitur model, tanpa DataFrame perantara)
         try:
-            result_tv = predict_energy_tv(input_df)
+            result_tv = predict_energy_tv(input_data)
             return jsonify({"predicted_energy_consumption": result_tv.tolist()}), 200
         except ValueError as ve:
             return jsonify({"error": str(ve)}), 400
@@ -30,9 +49,17 @@ def predict_tv():
 
 # Route untuk prediksi konsumsi energi berdasarkan AC
 @app.route('/predict-ac', methods=['POST'])
+@instrument_route('/predict-ac')
 def predict_energy_route():
+    # Mengambil input JSON dari POST request (body JSON rusak langsung dijawab 400)
+    input_data = read_json()
+
+    # Input berupa object, atau array of object (format lama route ini)
+    records = input_data if isinstance(input_data, list) else [input_data]
+    if not records or not all(isinstance(record, dict) for record in records):
+        return jsonify({"error": "Invalid input data format. Expected JSON object or array of objects."}), 400
+
     try:
-        input_data = request.json  # Mengambil input JSON dari POST request
         result_ac = predict_energy_ac(input_data)  # Memanggil fungsi prediksi energi AC
         return jsonify({"predicted_energy_consumption": result_ac.tolist()}), 200
     except ValueError as ve:
@@ -40,5 +67,119 @@ def predict_energy_route():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Fungsi untuk menjalankan prediksi batch dari body request (JSON array atau NDJSON)
+# `run_batch` menerima list record dan mengembalikan list hasil sesuai urutan input
+def batch_response(run_batch):
+    try:
+        records = parse_records(request.get_data(as_text=True), request.mimetype)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    max_batch_size = app.config['MAX_BATCH_SIZE']
+    if len(records) > max_batch_size:
+        return jsonify({"error": f"Batch too large: {len(records)} records, maximum is {max_batch_size}."}), 413
+
+    results = run_batch(records)
+    errors = sum(1 for result in results if "error" in result)
+    return jsonify({"results": results, "count": len(results), "errors": errors}), 200
+
+
+# Route untuk prediksi batch televisi
+@app.route('/predict-tv/batch', methods=['POST'])
+@instrument_route('/predict-tv/batch')
+def predict_tv_batch():
+    return batch_response(lambda records: predict_batch(predict_energy_tv, records))
+
+
+# Route untuk prediksi batch AC
+@app.route('/predict-ac/batch', methods=['POST'])
+@instrument_route('/predict-ac/batch')
+def predict_ac_batch():
+    return batch_response(lambda records: predict_batch(predict_energy_ac, records))
+
+
+# Route untuk estimasi konsumsi energi satu rumah dari daftar perangkat campuran
+# (JSON array, atau object dengan kunci 'appliances')
+@app.route('/predict-household', methods=['POST'])
+@instrument_route('/predict-household')
+def predict_household_route():
+    input_data = read_json()
+    devices = input_data.get('appliances') if isinstance(input_data, dict) else input_data
+    if not isinstance(devices, list):
+        return jsonify({"error": "Invalid input data format. Expected a JSON array of appliances "
+                                 "or an object with an 'appliances' array."}), 400
+
+    max_batch_size = app.config['MAX_BATCH_SIZE']
+    if len(devices) > max_batch_size:
+        return jsonify({"error": f"Too many appliances: {len(devices)}, maximum is {max_batch_size}."}), 413
+
+    results, total = predict_household(devices)
+    errors = sum(1 for result in results if "error" in result)
+    return jsonify({"results": results, "count": len(results), "errors": errors,
+                    "total_energy_consumption": total}), 200
+
+
+# Route untuk prediksi harga rumah
+@app.route('/predict-price', methods=['POST'])
+@instrument_route('/predict-price')
+def predict_price():
+    input_data = read_json()
+
+    if not isinstance(input_data, dict):
+        return jsonify({"error": "Invalid input data format. Expected JSON object."}), 400
+
+    try:
+        model = get_house_price_model()
+        result = model.predict_batch([input_data])[0]
+        if "error" in result:
+            return jsonify(result), 400
+        result["statistics"] = model.statistics(input_data['lokasi'], input_data['sub_lokasi'])
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Route untuk prediksi batch harga rumah
+@app.route('/predict-price/batch', methods=['POST'])
+@instrument_route('/predict-price/batch')
+def predict_price_batch():
+    return batch_response(lambda records: get_house_price_model().predict_batch(records))
+
+
+# Route readiness: 200 setelah semua model dimuat dan diuji (prewarm), 503 jika gagal.
+# Jika prewarm belum dijalankan di proses ini, prewarm dijalankan di request pertama.
+@app.route('/ready', methods=['GET'])
+def ready():
+    report = app.config['STARTUP_REPORT']
+    if report is None:
+        try:
+            report = prewarm_app()
+        except RuntimeError as e:
+            return jsonify({"status": "not ready", "error": str(e)}), 503
+    return jsonify({"status": "ready", "pid": os.getpid(), "startup": report}), 200
+
+
+# Route metrik format Prometheus (hanya tersedia jika ENABLE_METRICS=1)
+if METRICS_ENABLED:
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+# Fungsi untuk memuat dan menguji semua model sebelum server menerima request;
+# laporan waktu startup disimpan di app.config['STARTUP_REPORT']
+def prewarm_app():
+    app.config['STARTUP_REPORT'] = prewarm(import_seconds=IMPORT_SECONDS)
+    return app.config['STARTUP_REPORT']
+
+
+# Server WSGI yang mengimpor modul ini (misalnya gunicorn --preload) bisa melakukan
+# prewarm saat import dengan PREWARM_MODELS=1
+if os.environ.get('PREWARM_MODELS', '').lower() in ('1', 'true', 'yes', 'on'):
+    prewarm_app()
+
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    # Dengan debug=True server berjalan di proses anak reloader Werkzeug; prewarm hanya di proses itu
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true' and app.config['STARTUP_REPORT'] is None:
+        prewarm_app()
     app.run(debug=True)
@@ -0,0 +1,85 @@
+# app/loader/batch.py
+
+import json
+
+from .metrics import timed
+from .schema import ValidationError
+
+# Jumlah maksimum record per request batch
+MAX_BATCH_SIZE = 10000
+
+# Content type yang dibaca sebagai newline-delimited JSON
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-lines')
+
+
+# Fungsi untuk membaca record batch dari body request.
+# Body berupa JSON array of object, atau NDJSON (satu object per baris).
+# Baris NDJSON yang tidak valid tidak menggagalkan batch: baris tersebut
+# disimpan sebagai ValueError dan dilaporkan sebagai error per baris.
+@timed('parse_json')
+def parse_records(body, mimetype):
+    if mimetype in NDJSON_MIMETYPES:
+        records = []
+        for line_number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                records.append(ValueError(f"Invalid JSON on line {line_number}: {e}"))
+        return records
+
+    records = json.loads(body)
+    if not isinstance(records, list):
+        raise ValueError("Invalid input data format. Expected JSON array of objects.")
+    return records
+
+
+# Fungsi untuk prediksi satu batch record sekaligus.
+# Semua record yang valid diproses sekaligus sehingga preprocessing dan
+# model.predict hanya dijalankan sekali. Hasil dikembalikan sesuai urutan input.
+@timed('predict_batch', rows=lambda predict_fn, records: len(records))
+def predict_batch(predict_fn, records):
+    results = [None] * len(records)
+    valid_index = []
+    for i, record in enumerate(records):
+        if isinstance(record, dict):
+            valid_index.append(i)
+        elif isinstance(record, Exception):
+            results[i] = {"error": str(record)}
+        else:
+            results[i] = {"error": "Invalid input data format. Expected JSON object."}
+
+    if not valid_index:
+        return results
+
+    # Baris yang ditolak validasi skema (ValidationError) mendapat error masing-masing,
+    # lalu sisa baris diprediksi ulang sebagai satu batch
+    y_pred = None
+    while valid_index:
+        try:
+            y_pred = predict_fn([records[i] for i in valid_index])
+            break
+        except ValidationError as e:
+            if len(e.errors) != len(valid_index) or all(error is None for error in e.errors):
+                break
+            for i, error in zip(valid_index, e.errors):
+                if error is not None:
+                    results[i] = {"error": error}
+            valid_index = [i for i, error in zip(valid_index, e.errors) if error is None]
+        except Exception:
+            break
+
+    if y_pred is not None:
+        for i, value in zip(valid_index, y_pred):
+            results[i] = {"predicted_energy_consumption": float(value)}
+        return results
+
+    # Batch gagal: cari baris yang bermasalah dengan memprediksi per baris
+    for i in valid_index:
+        try:
+            value = predict_fn([records[i]])[0]
+            results[i] = {"predicted_energy_consumption": float(value)}
+        except Exception as e:
+            results[i] = {"error": str(e)}
+    return results
@@ -0,0 +1,143 @@
+# app/loader/batcher.py
+#
+# Micro-batching: request prediksi tunggal yang datang bersamaan (misalnya dari
+# thread Flask yang berbeda) dikumpulkan per tipe model lalu diprediksi sebagai satu
+# batch. Batch dikirim saat jumlah baris mencapai `max_batch_size` atau saat request
+# tertua sudah menunggu `max_wait` detik, lalu hasilnya dibagikan kembali ke setiap
+# request. Untuk model pohon, satu model.predict berisi 64 baris hampir sama mahalnya
+# dengan satu baris, jadi throughput naik tanpa perubahan di sisi client.
+#
+# Konfigurasi lewat environment variable:
+#   ENABLE_MICRO_BATCHING=1    mengaktifkan micro-batching
+#   MICRO_BATCH_SIZE           jumlah baris maksimum per batch (default 64)
+#   MICRO_BATCH_MAX_WAIT_MS    waktu tunggu maksimum dalam milidetik (default 2)
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from .cache import as_records
+from .metrics import timed
+from .schema import concat_arrays
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT = 0.002
+
+
+class _ModelQueue:
+    # Antrian request untuk satu tipe model, dilayani oleh satu thread worker
+    def __init__(self, batcher, model_type):
+        self.batcher = batcher
+        self.model_type = model_type
+        self.pending = deque()  # (records, arrays, future, waktu masuk)
+        self.rows = 0
+        self.cond = threading.Condition()
+        self.thread = None
+
+    def submit(self, records, arrays=None):
+        future = Future()
+        with self.cond:
+            self.pending.append((records, arrays, future, time.monotonic()))
+            self.rows += len(records)
+            # Thread tidak ikut ter-copy saat fork, jadi dicek ulang di setiap proses
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name=f'micro-batcher-{self.model_type}', daemon=True)
+                self.thread.start()
+            self.cond.notify()
+        return future
+
+    def _next_batch(self):
+        max_batch_size = self.batcher.max_batch_size
+        with self.cond:
+            while not self.pending:
+                self.cond.wait()
+            deadline = self.pending[0][3] + self.batcher.max_wait
+            while self.rows < max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+
+            batch = []
+            batch_rows = 0
+            while self.pending and (not batch or batch_rows + len(self.pending[0][0]) <= max_batch_size):
+                records, arrays, future, _ = self.pending.popleft()
+                batch.append((records, arrays, future))
+                batch_rows += len(records)
+            self.rows -= batch_rows
+            return batch
+
+    def _run(self):
+        while True:
+            self.batcher.execute(self.model_type, self._next_batch())
+
+
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT):
+        self.predict_fn = predict_fn  # predict_fn(model_type, records, arrays) -> array hasil
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    # Membuat batcher dari environment variable; None jika micro-batching tidak aktif
+    @classmethod
+    def from_env(cls, predict_fn):
+        if os.environ.get('ENABLE_MICRO_BATCHING', '').lower() not in ('1', 'true', 'yes', 'on'):
+            return None
+        return cls(predict_fn,
+                   max_batch_size=int(os.environ.get('MICRO_BATCH_SIZE', DEFAULT_MAX_BATCH_SIZE)),
+                   max_wait=float(os.environ.get('MICRO_BATCH_MAX_WAIT_MS', DEFAULT_MAX_WAIT * 1000)) / 1000)
+
+    def _queue(self, model_type):
+        queue = self._queues.get(model_type)
+        if queue is None:
+            with self._lock:
+                queue = self._queues.setdefault(model_type, _ModelQueue(self, model_type))
+        return queue
+
+    # Mengirim record ke antrian; hasilnya berupa Future. `arrays` (opsional) adalah
+    # hasil FeatureSchema.arrays dari input yang sudah divalidasi.
+    def submit(self, model_type, input_data, arrays=None):
+        return self._queue(model_type).submit(as_records(input_data), arrays)
+
+    # Prediksi sinkron (untuk thread Flask); request yang sudah sebesar satu batch
+    # penuh langsung diprediksi tanpa antri
+    def predict(self, model_type, input_data, arrays=None):
+        records = as_records(input_data)
+        if len(records) >= self.max_batch_size:
+            return self.predict_fn(model_type, records, arrays)
+        return self._queue(model_type).submit(records, arrays).result()
+
+    # Prediksi untuk server async (ASGI): menunggu hasil tanpa memblokir event loop
+    async def predict_async(self, model_type, input_data, arrays=None):
+        records = as_records(input_data)
+        if len(records) >= self.max_batch_size:
+            return await asyncio.get_running_loop().run_in_executor(None, self.predict_fn, model_type, records, arrays)
+        return await asyncio.wrap_future(self._queue(model_type).submit(records, arrays))
+
+    @timed('micro_batch', rows=lambda self, model_type, batch: sum(len(records) for records, _, _ in batch))
+    def execute(self, model_type, batch):
+        all_records = [record for records, _, _ in batch for record in records]
+        # Array hasil validasi digabung hanya jika semua request di batch memilikinya
+        all_arrays = None
+        if all(arrays is not None for _, arrays, _ in batch):
+            all_arrays = concat_arrays([arrays for _, arrays, _ in batch])
+        try:
+            y_pred = self.predict_fn(model_type, all_records, all_arrays)
+        except Exception:
+            # Satu request yang rusak tidak boleh menggagalkan request lain di batch yang sama
+            for records, arrays, future in batch:
+                try:
+                    future.set_result(self.predict_fn(model_type, records, arrays))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for records, _, future in batch:
+            future.set_result(y_pred[offset:offset + len(records)])
+            offset += len(records)
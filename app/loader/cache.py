@@ -0,0 +1,166 @@
+# app/loader/cache.py
+
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .registry import registry
+from .schema import get_schema, select_rows
+
+# Konfigurasi cache lewat environment variable:
+#   PREDICTION_CACHE_SIZE  jumlah maksimum hasil yang disimpan (0 = cache mati)
+#   PREDICTION_CACHE_TTL   umur maksimum hasil dalam detik (kosong = tanpa batas)
+#   PREDICTION_CACHE_MAX_ROWS  request dengan lebih banyak record dari ini tidak
+#                              memakai cache (0 = tanpa batas)
+# Untuk batch besar, menghitung kunci kanonik per record lebih mahal daripada
+# inferensi vektor sekaligus, bahkan jika semua record ada di cache (titik impas
+# sekitar 16 record untuk AC dan 64 untuk TV, lihat benchmark.py).
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CACHE_MAX_ROWS = 16
+
+
+# Fungsi untuk mengubah input (dictionary, dictionary of list, list of dictionary,
+# atau DataFrame) menjadi list of dictionary
+def as_records(input_data):
+    if isinstance(input_data, pd.DataFrame):
+        return input_data.to_dict('records')
+    if isinstance(input_data, dict):
+        if any(isinstance(value, list) for value in input_data.values()):
+            return pd.DataFrame(input_data).to_dict('records')
+        return [input_data]
+    return list(input_data)
+
+
+def _numeric(value):
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def _categorical(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+# Kunci kanonik sebuah record: hanya kolom skema, urutan kolom tetap, numerik
+# dinormalisasi ke float (1, 1.0 dan "1" sama) dan nilai kosong menjadi None.
+# Nilai kategori tidak diubah karena OneHotEncoder membedakan 'Yes' dan 'yes'.
+# Tuple langsung dipakai sebagai kunci dict (hash tuple jauh lebih murah daripada
+# serialisasi JSON + digest); nilai yang tidak hashable diserialisasi ke JSON.
+def canonical_key(schema, record):
+    values = tuple(_categorical(record.get(col)) if categorical else _numeric(record.get(col))
+                   for col, categorical in zip(schema.columns, schema.is_categorical))
+    try:
+        hash(values)
+    except TypeError:
+        return json.dumps(values, separators=(',', ':'), default=str)
+    return values
+
+
+class PredictionCache:
+    # Cache LRU/TTL hasil prediksi per record, dengan kunci (tipe model, versi model,
+    # spesifikasi kanonik). Saat registry memuat versi model baru, semua hasil
+    # dari versi lama untuk tipe model tersebut dibuang.
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, ttl=None, max_rows=DEFAULT_CACHE_MAX_ROWS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        ttl = os.environ.get('PREDICTION_CACHE_TTL')
+        return cls(maxsize=int(os.environ.get('PREDICTION_CACHE_SIZE', DEFAULT_CACHE_SIZE)),
+                   ttl=float(ttl) if ttl else None,
+                   max_rows=int(os.environ.get('PREDICTION_CACHE_MAX_ROWS', DEFAULT_CACHE_MAX_ROWS)))
+
+    def _check_version(self, model_type, version):
+        if self._versions.get(model_type) == version:
+            return
+        stale = [key for key in self._entries if key[0] == model_type]
+        for key in stale:
+            del self._entries[key]
+        self._versions[model_type] = version
+
+    # Prediksi dengan cache: hanya record yang belum ada di cache yang dikirim ke
+    # `predict_fn(model_type, records, arrays)`, sekaligus dalam satu batch.
+    # `arrays` (opsional) adalah hasil FeatureSchema.arrays dari input yang sudah
+    # divalidasi; baris yang sesuai ikut diteruskan ke `predict_fn`.
+    def predict(self, model_type, input_data, predict_fn, arrays=None):
+        if self.maxsize <= 0:
+            return predict_fn(model_type, input_data, arrays)
+
+        # Batch yang lebih besar dari cache tidak mungkin tersimpan utuh, dan batch di
+        # atas max_rows lebih cepat diprediksi langsung daripada dicari di cache
+        records = as_records(input_data)
+        if len(records) > self.maxsize or 0 < self.max_rows < len(records):
+            return predict_fn(model_type, records, arrays)
+
+        version = registry.version(model_type)
+        schema = get_schema(model_type)
+        keys = [(model_type, version, canonical_key(schema, record)) for record in records]
+
+        y_pred = np.empty(len(records), dtype=np.float64)
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(model_type, version)
+            for i, key in enumerate(keys):
+                cached = self._entries.get(key)
+                if cached is not None and (cached[1] is None or cached[1] > now):
+                    self._entries.move_to_end(key)
+                    y_pred[i] = cached[0]
+                else:
+                    missing.append(i)
+            self.hits += len(records) - len(missing)
+            self.misses += len(missing)
+
+        if not missing:
+            return y_pred
+
+        if arrays is not None and len(missing) < len(records):
+            arrays = select_rows(arrays, missing)
+        values = predict_fn(model_type, [records[i] for i in missing], arrays)
+        y_pred[missing] = values
+        expires_at = now + self.ttl if self.ttl else None
+        with self._lock:
+            # Jangan simpan hasil jika model sudah dimuat ulang selama prediksi berjalan
+            if self._versions.get(model_type) != version:
+                return y_pred
+            for i, value in zip(missing, values):
+                self._entries[keys[i]] = (float(value), expires_at)
+                self._entries.move_to_end(keys[i])
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return y_pred
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "max_rows": self.max_rows,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+# Cache bersama untuk semua modul loader
+prediction_cache = PredictionCache.from_env()
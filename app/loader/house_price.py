@@ -0,0 +1,228 @@
+# app/loader/house_price.py
+
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .listings_cache import load_columns, load_table
+from .metrics import timed
+from .price_stats import PriceStats
+
+# Path untuk file CSV dataset harga rumah
+base_path = os.path.dirname(__file__)  # Mengambil path direktori saat ini
+csv_file_path = os.path.normpath(os.path.join(base_path, '../streamlit/Harga-Rumah-Model.csv'))
+
+# Mapping sub-lokasi berdasarkan kota
+sub_lokasi_dict = {
+    'Jakarta': ['Jakarta Utara', 'Jakarta Barat', 'Jakarta Selatan', 'Jakarta Timur', 'Jakarta Pusat'],
+    'Bogor': ['Bogor Utara', 'Bogor Selatan', 'Bogor Timur', 'Bogor Barat', 'Bogor Tengah'],
+    'Tangerang': ['Tangerang Kota', 'Tangerang Selatan', 'Tangerang Utara', 'Tangerang Barat'],
+    'Depok': ['Depok'],
+    'Bekasi': ['Bekasi Barat', 'Bekasi Timur', 'Bekasi Utara', 'Bekasi Selatan']
+}
+
+# Kolom fitur untuk model regresi harga
+feature_columns = ['LT', 'LB', 'JKT', 'JKM', 'GRS']
+
+# Nilai GRS (garasi) yang diterima dari input
+garasi_values = {'ADA': 1, 'TIDAK ADA': 0, 'YA': 1, 'TIDAK': 0, 'TRUE': 1, 'FALSE': 0, '1': 1, '0': 0}
+
+
+# Fungsi untuk preprocessing kolom HARGA secara vektor:
+# hapus titik sebagai pemisah ribuan ('28.000.000.000') lalu konversi ke angka
+def parse_harga(harga):
+    return pd.to_numeric(harga.astype(str).str.replace('.', '', regex=False), errors='coerce')
+
+
+# Preprocessing listing mentah hasil read_csv
+def parse_listings(df):
+    # Ubah nilai 'GRS' menjadi numerik
+    df['GRS'] = df['GRS'].map({'ADA': 1, 'TIDAK ADA': 0})
+    df['HARGA'] = parse_harga(df['HARGA'])
+    return df
+
+
+# Kolom bertipe untuk cache kolumnar: HARGA int64, GRS bool, KOTA kategori.
+# Baris dengan nilai yang tidak valid (tidak dipakai model) dibuang.
+def listing_columns(df):
+    df = parse_listings(df)
+    for col in feature_columns[:-1]:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = df.dropna(subset=feature_columns + ['HARGA', 'KOTA'])
+    columns = {'HARGA': df['HARGA'].to_numpy(dtype=np.int64)}
+    columns.update((col, df[col].to_numpy()) for col in feature_columns[:-1])
+    columns['GRS'] = df['GRS'].to_numpy(dtype=bool)
+    columns['KOTA'] = pd.Categorical(df['KOTA'].astype(str))
+    return columns
+
+
+# Load dataset harga rumah dari cache kolumnar (dibangun ulang otomatis jika CSV berubah)
+@timed('load_listings')
+def load_data(file_path=csv_file_path):
+    return pd.DataFrame(load_columns(file_path, listing_columns))
+
+
+# Path file state inkremental untuk sebuah CSV (disimpan di sebelahnya)
+def state_path(file_path):
+    return os.path.splitext(file_path)[0] + '.state.json'
+
+
+# Daftar wilayah (lokasi, sub_lokasi) yang dimodelkan
+def price_regions():
+    return [(lokasi, sub_lokasi) for lokasi, daftar_sub_lokasi in sub_lokasi_dict.items()
+            for sub_lokasi in daftar_sub_lokasi]
+
+
+# Apakah byte terakhir dari `size` byte pertama file adalah akhir baris
+def _ends_with_newline(file_path, size):
+    if size <= 0:
+        return False
+    with open(file_path, 'rb') as file:
+        file.seek(size - 1)
+        return file.read(1) == b'\n'
+
+
+# Statistik dari seluruh CSV lewat cache kolumnar (teks CSV hanya di-parse jika isinya
+# berubah sejak cache dibangun); sha256 dari cache menjadi sidik jari bagian CSV yang
+# sudah diproses untuk pembaruan inkremental berikutnya. CSV yang baris terakhirnya
+# belum lengkap diproses lewat fold_csv, yang menunda baris itu sampai selesai ditulis.
+def build_price_stats(file_path=csv_file_path):
+    stats = PriceStats(price_regions(), feature_columns)
+    columns, source = load_table(file_path, listing_columns)
+    if not _ends_with_newline(file_path, source['size']):
+        return stats, stats.fold_csv(file_path, parse_listings)
+    rows = stats.add(pd.DataFrame(columns))
+    stats.set_source(source['size'], source['sha256'], rows)
+    return stats, rows
+
+
+# Fungsi untuk mengubah nilai GRS dari input (1/0, true/false, 'ADA'/'TIDAK ADA', 'Ya'/'Tidak')
+def parse_garasi(values):
+    return np.array([garasi_values.get(str(value).strip().upper(), np.nan) for value in values], dtype=float)
+
+
+class HousePriceModel:
+    # Model harga rumah per (lokasi, sub_lokasi). Koefisien regresi linear setiap wilayah
+    # dihitung dari statistik cukup (PriceStats) dan disimpan dalam satu matriks sehingga
+    # prediksi batch cukup berupa gather + dot product per baris.
+    def __init__(self, stats, source=None):
+        self.source = source
+        self.regions = list(stats.regions)
+        self.region_ids = {region: i for i, region in enumerate(self.regions)}
+        self.coef, self.intercept = stats.coefficients()
+        self.row_counts = stats.row_counts
+        self.stats = stats.statistics()  # mean, median, min, max
+
+    # Model dari DataFrame yang sudah di-preprocess (seluruh data sekaligus)
+    @classmethod
+    def from_frame(cls, df, source=None):
+        stats = PriceStats(price_regions(), feature_columns)
+        stats.add(df)
+        return cls(stats, source=source)
+
+    # Model dari CSV secara inkremental: statistik cukup dari pembaruan sebelumnya dimuat
+    # dari file state, lalu hanya baris yang ditambahkan sejak itu yang dibaca dan diproses.
+    # Jika CSV diedit (bukan ditambah) atau state belum ada, statistik dibangun dari awal
+    # lewat cache kolumnar (build_price_stats).
+    @classmethod
+    @timed('load_price_model')
+    def from_csv(cls, file_path=csv_file_path, state_file=None):
+        state_file = state_file or state_path(file_path)
+        stat = os.stat(file_path)
+        stats = PriceStats.load(state_file, price_regions(), feature_columns)
+        rows = stats.fold_csv(file_path, parse_listings) if stats is not None else None
+        if rows is None:
+            stats, rows = build_price_stats(file_path)
+        if rows:
+            try:
+                stats.save(state_file)
+            except OSError as e:
+                logging.warning("Cannot save house price state to %s: %s", state_file, e)
+        return cls(stats, source=(file_path, stat.st_mtime_ns, stat.st_size))
+
+    def _region_id(self, lokasi, sub_lokasi):
+        region_id = self.region_ids.get((lokasi, sub_lokasi))
+        if region_id is None:
+            raise ValueError(f"Unknown location '{sub_lokasi}' in '{lokasi}'.")
+        return region_id
+
+    # Apakah ada data training untuk (lokasi, sub_lokasi)
+    def has_data(self, lokasi, sub_lokasi):
+        return bool(self.row_counts[self._region_id(lokasi, sub_lokasi)])
+
+    # Statistik harga (rata-rata, median, minimum, maksimum) untuk sub-lokasi
+    def statistics(self, lokasi, sub_lokasi):
+        mean, median, min_price, max_price = self.stats[self._region_id(lokasi, sub_lokasi)]
+        return {"mean": mean, "median": median, "min": min_price, "max": max_price}
+
+    # Prediksi harga untuk satu rumah
+    def predict(self, lokasi, sub_lokasi, lt, lb, kamar_tidur, kamar_mandi, garasi):
+        region_id = self._region_id(lokasi, sub_lokasi)
+        if not self.row_counts[region_id]:
+            raise ValueError(f"No data for '{sub_lokasi}' in '{lokasi}'.")
+        x = np.array([lt, lb, kamar_tidur, kamar_mandi, garasi], dtype=float)
+        return float(self.intercept[region_id] + x @ self.coef[region_id])
+
+    # Prediksi harga untuk banyak record sekaligus. Setiap record berisi 'lokasi',
+    # 'sub_lokasi', 'LT', 'LB', 'JKT', 'JKM' dan 'GRS'. Hasil sesuai urutan input,
+    # dengan error per baris untuk record yang tidak valid.
+    @timed('price_predict_batch', rows=lambda self, records: len(records))
+    def predict_batch(self, records):
+        n_rows = len(records)
+        results = [None] * n_rows
+        rows = [record if isinstance(record, dict) else {} for record in records]
+
+        region_ids = np.array([self.region_ids.get((row.get('lokasi'), row.get('sub_lokasi')), -1) for row in rows],
+                              dtype=np.int64)
+        X = np.empty((n_rows, len(feature_columns)))
+        for j, col in enumerate(feature_columns[:-1]):
+            X[:, j] = pd.to_numeric(pd.Series([row.get(col) for row in rows], dtype=object), errors='coerce')
+        X[:, -1] = parse_garasi(row.get('GRS') for row in rows)
+
+        known = region_ids >= 0
+        has_data = known & (self.row_counts[np.where(known, region_ids, 0)] > 0)
+        complete = ~np.isnan(X).any(axis=1)
+        valid = has_data & complete
+
+        ids = region_ids[valid]
+        y_pred = self.intercept[ids] + np.einsum('ij,ij->i', X[valid], self.coef[ids])
+        for i, value in zip(np.flatnonzero(valid), y_pred):
+            results[i] = {"predicted_price": float(value)}
+
+        for i in np.flatnonzero(~valid):
+            record = records[i]
+            if isinstance(record, Exception):
+                results[i] = {"error": str(record)}
+            elif not isinstance(record, dict):
+                results[i] = {"error": "Invalid input data format. Expected JSON object."}
+            elif not known[i]:
+                results[i] = {"error": f"Unknown location '{record.get('sub_lokasi')}' in '{record.get('lokasi')}'."}
+            elif not has_data[i]:
+                results[i] = {"error": f"No data for '{record.get('sub_lokasi')}' in '{record.get('lokasi')}'."}
+            else:
+                missing = [col for col, value in zip(feature_columns, X[i]) if np.isnan(value)]
+                results[i] = {"error": f"Invalid or missing values for: {', '.join(missing)}."}
+        return results
+
+
+_models = {}
+_lock = threading.Lock()
+
+
+# Fungsi untuk mengambil model harga rumah; dibangun sekali per proses dan
+# dibangun ulang otomatis jika file CSV berubah (mtime atau ukuran)
+def get_model(file_path=csv_file_path):
+    stat = os.stat(file_path)
+    source = (file_path, stat.st_mtime_ns, stat.st_size)
+    model = _models.get(file_path)
+    if model is not None and model.source == source:
+        return model
+    with _lock:
+        model = _models.get(file_path)
+        if model is None or model.source != source:
+            model = HousePriceModel.from_csv(file_path)
+            _models[file_path] = model
+        return model
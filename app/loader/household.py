@@ -0,0 +1,103 @@
+# app/loader/household.py
+#
+# Estimasi konsumsi energi tahunan satu rumah dari daftar perangkat campuran.
+# Setiap perangkat berupa dictionary dengan kunci 'appliance' (jenis perangkat) dan
+# fitur sesuai model perangkat tersebut. Perangkat dikelompokkan per jenis, setiap
+# kelompok diprediksi sebagai satu batch, dan semua kelompok dijalankan bersamaan di
+# thread pool (sebagian besar kerja numpy/sklearn melepas GIL).
+#
+# Prediksi air cleaner masih dalam satuan target yang distandardisasi (scaler target
+# tidak ikut disimpan, lihat load_air_cleaner.py), jadi hasilnya ditandai
+# "unscaled": true dan tidak ikut dijumlahkan ke total kWh/tahun.
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .batch import predict_batch
+from .load_ac import predict_energy_consumption
+from .load_air_cleaner import predict_air_cleaner_energy_consumption
+from .load_refrigerator import predict_refrigerator_energy_consumption
+from .load_tv import predict_tv_energy_consumption
+from .metrics import timed
+
+# Fungsi prediksi batch untuk setiap tipe model
+PREDICT_FUNCTIONS = {
+    'air_conditioners': predict_energy_consumption,
+    'televisions': predict_tv_energy_consumption,
+    'refrigerators': predict_refrigerator_energy_consumption,
+    'air_cleaner': predict_air_cleaner_energy_consumption,
+}
+
+# Nilai 'appliance' yang diterima dari input (huruf besar/kecil diabaikan)
+APPLIANCE_TYPES = {
+    'ac': 'air_conditioners',
+    'air_conditioner': 'air_conditioners',
+    'air_conditioners': 'air_conditioners',
+    'tv': 'televisions',
+    'television': 'televisions',
+    'televisions': 'televisions',
+    'refrigerator': 'refrigerators',
+    'refrigerators': 'refrigerators',
+    'air_cleaner': 'air_cleaner',
+    'air_cleaners': 'air_cleaner',
+}
+
+# Tipe model yang hasilnya bukan kWh/tahun (tidak ikut dijumlahkan ke total)
+UNSCALED_MODELS = {'air_cleaner'}
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+
+# Thread pool bersama; dibuat ulang setelah fork karena thread tidak ikut ter-copy
+def _get_executor():
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(max_workers=len(PREDICT_FUNCTIONS), thread_name_prefix='household')
+                _executor_pid = os.getpid()
+    return _executor
+
+
+# Fungsi untuk prediksi semua perangkat dalam satu rumah. Mengembalikan hasil per
+# perangkat (urutan sama dengan input, dengan error per perangkat) dan total kWh/tahun
+# dari perangkat yang berhasil diprediksi (tanpa hasil yang ditandai "unscaled").
+@timed('predict_household', rows=lambda devices: len(devices))
+def predict_household(devices):
+    results = [None] * len(devices)
+    groups = {}
+    for i, device in enumerate(devices):
+        if isinstance(device, Exception):
+            results[i] = {"error": str(device)}
+        elif not isinstance(device, dict):
+            results[i] = {"error": "Invalid input data format. Expected JSON object."}
+        else:
+            model_type = APPLIANCE_TYPES.get(str(device.get('appliance', '')).strip().lower())
+            if model_type is None:
+                results[i] = {"error": f"Unknown appliance '{device.get('appliance')}'. "
+                                       f"Expected one of: {', '.join(sorted(APPLIANCE_TYPES))}."}
+            else:
+                groups.setdefault(model_type, []).append(i)
+
+    def run_group(model_type):
+        return predict_batch(PREDICT_FUNCTIONS[model_type], [devices[i] for i in groups[model_type]])
+
+    if len(groups) == 1:
+        group_results = {model_type: run_group(model_type) for model_type in groups}
+    else:
+        futures = {model_type: _get_executor().submit(run_group, model_type) for model_type in groups}
+        group_results = {model_type: future.result() for model_type, future in futures.items()}
+
+    for model_type, indices in groups.items():
+        unscaled = model_type in UNSCALED_MODELS
+        for i, result in zip(indices, group_results[model_type]):
+            results[i] = {"appliance": model_type, **result}
+            if unscaled and "predicted_energy_consumption" in result:
+                results[i]["unscaled"] = True
+
+    total = sum(result["predicted_energy_consumption"] for result in results
+                if "predicted_energy_consumption" in result and not result.get("unscaled"))
+    return results, total
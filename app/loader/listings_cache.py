@@ -0,0 +1,146 @@
+# app/loader/listings_cache.py
+#
+# Cache kolumnar biner untuk dataset CSV (misalnya Harga-Rumah-Model.csv), supaya CSV
+# tidak di-parse ulang sebagai teks di setiap proses. CSV dikonversi sekali menjadi
+# satu file .npy per kolom (kategori disimpan sebagai kode integer dengan kamus
+# kategori di meta.json), lalu pemuatan berikutnya cukup memory-map file .npy tersebut.
+#
+# Struktur cache di sebelah CSV:
+#   <nama>.cache/meta.json         versi, mtime/ukuran/sha256 CSV, dtype dan kategori kolom
+#   <nama>.cache/<sha256[:16]>/    file .npy per kolom untuk isi CSV tersebut
+#
+# Cache dipakai ulang selama mtime dan ukuran CSV sama; jika berbeda, sha256 CSV
+# dihitung dan cache hanya dibangun ulang jika isinya memang berubah.
+#
+# Membangun cache untuk CSV tertentu (dijalankan dari direktori app/):
+#   python -m loader.listings_cache ../ML-preparation/Dataset/Harga-Rumah-Model.csv
+
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+
+
+# Path direktori cache untuk sebuah CSV
+def cache_dir(file_path):
+    return os.path.splitext(file_path)[0] + '.cache'
+
+
+def _read_meta(directory):
+    try:
+        with open(os.path.join(directory, 'meta.json')) as file:
+            meta = json.load(file)
+        return meta if meta.get('version') == CACHE_VERSION else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(directory, meta):
+    path = os.path.join(directory, 'meta.json')
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(meta, file)
+    os.replace(tmp_path, path)
+
+
+# Memuat kolom dari cache (memory-mapped, read-only)
+def _load_arrays(directory, meta):
+    data_dir = os.path.join(directory, meta['data'])
+    columns = {}
+    for name, info in meta['columns'].items():
+        values = np.load(os.path.join(data_dir, info['file']), mmap_mode='r')
+        if 'categories' in info:
+            values = pd.Categorical.from_codes(values, categories=info['categories'])
+        columns[name] = values
+    return columns
+
+
+# Menulis kolom ke direktori data baru lalu mengganti meta.json; direktori data lama
+# dihapus setelahnya (proses yang masih memory-map file lama tetap bisa membacanya)
+def _write_arrays(directory, columns, source):
+    data = source['sha256'][:16]
+    data_dir = os.path.join(directory, data)
+    os.makedirs(data_dir, exist_ok=True)
+
+    meta_columns = {}
+    for i, (name, values) in enumerate(columns.items()):
+        info = {"file": f'{i}.npy'}
+        if isinstance(values, pd.Categorical):
+            info["categories"] = values.categories.tolist()
+            values = values.codes
+        values = np.ascontiguousarray(values)
+        info["dtype"] = values.dtype.str
+        tmp_path = os.path.join(data_dir, f'{i}.{os.getpid()}.tmp.npy')
+        np.save(tmp_path, values)
+        os.replace(tmp_path, os.path.join(data_dir, info['file']))
+        meta_columns[name] = info
+
+    rows = len(next(iter(columns.values()))) if columns else 0
+    _write_meta(directory, {"version": CACHE_VERSION, "source": source, "data": data,
+                            "rows": rows, "columns": meta_columns})
+    for entry in os.listdir(directory):
+        if entry != data and os.path.isdir(os.path.join(directory, entry)):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+# Fungsi untuk memuat dataset CSV sebagai dictionary kolom (numpy array, atau
+# pd.Categorical untuk kolom kategorikal). `convert` mengubah DataFrame hasil read_csv
+# menjadi dictionary kolom tersebut dan hanya dipanggil saat cache dibangun ulang.
+# Jika cache tidak bisa ditulis, kolom hasil konversi langsung dikembalikan.
+def load_columns(file_path, convert, directory=None):
+    return load_table(file_path, convert, directory)[0]
+
+
+# Sama seperti `load_columns`, tetapi juga mengembalikan sumber kolom tersebut:
+# {"mtime_ns", "size", "sha256"} dari isi CSV yang dikonversi
+def load_table(file_path, convert, directory=None):
+    directory = directory or cache_dir(file_path)
+    stat = os.stat(file_path)
+    meta = _read_meta(directory)
+    if meta is not None and (meta['source']['mtime_ns'], meta['source']['size']) == (stat.st_mtime_ns, stat.st_size):
+        try:
+            return _load_arrays(directory, meta), meta['source']
+        except (OSError, ValueError, KeyError):
+            meta = None
+
+    # CSV dibaca sekali; sha256 dan konversi memakai byte yang sama (CSV bisa berubah
+    # sementara itu, dan cache harus cocok dengan isi yang benar-benar dikonversi)
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    source = {"mtime_ns": stat.st_mtime_ns, "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+    if meta is not None and meta['source']['sha256'] == source['sha256']:
+        # Isi CSV sama (misalnya hanya di-touch): cukup perbarui mtime di meta.json
+        try:
+            columns = _load_arrays(directory, meta)
+            _write_meta(directory, {**meta, "source": source})
+            return columns, source
+        except (OSError, ValueError, KeyError):
+            pass
+
+    columns = convert(pd.read_csv(io.BytesIO(data)))
+    try:
+        _write_arrays(directory, columns, source)
+        return _load_arrays(directory, _read_meta(directory)), source
+    except (OSError, TypeError) as e:
+        logging.warning("Cannot write columnar cache for %s to %s: %s", file_path, directory, e)
+        return columns, source
+
+
+def main():
+    from .house_price import csv_file_path, load_data
+
+    for file_path in sys.argv[1:] or [csv_file_path]:
+        df = load_data(file_path)
+        print(f"{file_path}: {len(df)} rows -> {cache_dir(file_path)}")
+
+
+if __name__ == '__main__':
+    main()
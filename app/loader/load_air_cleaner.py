@@ -0,0 +1,56 @@
+# app/loader/load_air_cleaner.py
+#
+# Prediksi konsumsi energi air cleaner. Model dilatih pada kolom hasil pd.get_dummies
+# (misalnya 'filter_1_type_HEPA'), jadi input boleh berisi kolom dummy tersebut atau
+# nilai aslinya ('filter_1_type': 'HEPA') yang diubah di sini menjadi kolom dummy.
+# Model dilatih pada fitur dan target yang sudah distandardisasi dan scaler-nya tidak
+# ikut disimpan, sehingga fitur numerik diharapkan sudah dalam skala training dan
+# hasil prediksi dikembalikan apa adanya.
+
+from .cache import as_records
+from .predictor import predict
+from .registry import registry
+
+# Kolom kategorikal asli yang di-encode dengan pd.get_dummies saat training
+DUMMY_PREFIXES = ('technology_types', 'filter_1_type', 'filter_2_type', 'filter_3_type', 'filter_4_type',
+                  'network_capability')
+
+
+# Kolom dummy model untuk setiap kolom kategorikal asli
+def _dummy_columns(model):
+    return {prefix: [col for col in model.feature_names_in_ if col.startswith(prefix + '_')]
+            for prefix in DUMMY_PREFIXES}
+
+
+# Fungsi untuk mengubah nilai kategorikal asli menjadi kolom dummy (kategori yang
+# tidak dikenal menjadi semua nol, sama seperti pd.get_dummies pada data baru)
+def expand_dummies(records):
+    dummy_columns = registry.derived('air_cleaner', 'dummy_columns', _dummy_columns)
+    expanded = []
+    for record in records:
+        # Record yang bukan dictionary diteruskan apa adanya (ditolak oleh validasi skema)
+        if not isinstance(record, dict) or not any(prefix in record for prefix in DUMMY_PREFIXES):
+            expanded.append(record)
+            continue
+        row = dict(record)
+        for prefix, columns in dummy_columns.items():
+            if prefix not in row:
+                continue
+            value = row.pop(prefix)
+            for col in columns:
+                row[col] = 0
+            if value is not None and f'{prefix}_{value}' in columns:
+                row[f'{prefix}_{value}'] = 1
+        expanded.append(row)
+    return expanded
+
+
+# Fungsi untuk preprocessing input air cleaner (JSON atau DataFrame) menjadi record
+# dengan kolom dummy seperti saat training
+def preprocess_input(input_data):
+    return expand_dummies(as_records(input_data))
+
+
+# Fungsi untuk prediksi konsumsi energi air cleaner dari input JSON atau DataFrame
+def predict_air_cleaner_energy_consumption(input_data):
+    return predict('air_cleaner', preprocess_input(input_data))
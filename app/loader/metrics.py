@@ -0,0 +1,165 @@
+# app/loader/metrics.py
+#
+# Instrumentasi opsional untuk jalur prediksi, aktif jika ENABLE_METRICS=1 saat
+# proses dimulai. Jika tidak aktif, decorator `timed` dan `instrument_route`
+# mengembalikan fungsi aslinya apa adanya: tidak ada wrapper, tidak ada overhead.
+#
+# Metrik diekspor dalam format teks Prometheus lewat route /metrics di app.py.
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+METRICS_ENABLED = os.environ.get('ENABLE_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+
+PREFIX = 'house_insight'
+
+# Batas bucket histogram (detik) untuk durasi tahap dan request
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Batas bucket histogram untuk jumlah baris per batch
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # labels -> [counts per bucket..., +Inf], sum
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f'{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.label_names, labels)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.label_names, labels)} {cumulative}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f'{self.name}{_labels(self.label_names, labels)} {value}')
+        return lines
+
+
+stage_seconds = Histogram(f'{PREFIX}_stage_seconds', 'Time spent per prediction stage.', ('stage',), LATENCY_BUCKETS)
+stage_errors = Counter(f'{PREFIX}_errors_total', 'Exceptions raised per prediction stage and type.', ('stage', 'type'))
+batch_size = Histogram(f'{PREFIX}_batch_size', 'Rows per call for batched stages.', ('stage',), BATCH_SIZE_BUCKETS)
+request_seconds = Histogram(f'{PREFIX}_request_seconds', 'HTTP request duration per route.', ('route',), LATENCY_BUCKETS)
+requests_total = Counter(f'{PREFIX}_requests_total', 'HTTP requests per route and status code.', ('route', 'status'))
+
+
+# Decorator untuk mengukur durasi sebuah tahap, menghitung exception per tipe,
+# dan (opsional) mencatat ukuran batch dari argumen fungsi lewat `rows(*args, **kwargs)`
+def timed(stage, rows=None):
+    def decorator(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        labels = (stage,)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                stage_errors.inc((stage, type(e).__name__))
+                raise
+            finally:
+                stage_seconds.observe(labels, time.perf_counter() - started)
+                if rows is not None:
+                    try:
+                        batch_size.observe(labels, rows(*args, **kwargs))
+                    except Exception:
+                        pass
+        return wrapper
+    return decorator
+
+
+# Decorator untuk view Flask: durasi request dan jumlah request per status code
+def instrument_route(route):
+    def decorator(view):
+        if not METRICS_ENABLED:
+            return view
+        from werkzeug.exceptions import HTTPException
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            status = 500
+            try:
+                response = view(*args, **kwargs)
+                status = response[1] if isinstance(response, tuple) else getattr(response, 'status_code', 200)
+                return response
+            except HTTPException as e:
+                # Error HTTP dari Flask/werkzeug (misalnya 400 untuk body JSON rusak)
+                status = e.code or 500
+                raise
+            finally:
+                request_seconds.observe((route,), time.perf_counter() - started)
+                requests_total.inc((route, str(status)))
+        return wrapper
+    return decorator
+
+
+# Semua metrik dalam format teks Prometheus
+def render_metrics():
+    from .cache import prediction_cache
+
+    lines = []
+    for metric in (requests_total, request_seconds, stage_seconds, stage_errors, batch_size):
+        lines.extend(metric.render())
+
+    cache_stats = prediction_cache.stats()
+    for key in ('hits', 'misses', 'evictions'):
+        name = f'{PREFIX}_prediction_cache_{key}_total'
+        lines.extend([f'# HELP {name} Prediction cache {key}.', f'# TYPE {name} counter', f'{name} {cache_stats[key]}'])
+    name = f'{PREFIX}_prediction_cache_size'
+    lines.extend([f'# HELP {name} Entries in the prediction cache.', f'# TYPE {name} gauge', f'{name} {cache_stats["size"]}'])
+    return '\n'.join(lines) + '\n'
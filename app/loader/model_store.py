@@ -0,0 +1,96 @@
+# app/loader/model_store.py
+#
+# Format model ringkas (.joblib tanpa kompresi) yang bisa di-memory-map.
+# Array numerik besar (tabel node pohon, mean/scale scaler) dibuka read-only dengan
+# mmap_mode='r', sehingga beberapa proses worker berbagi halaman memori yang sama
+# lewat page cache OS, bukan masing-masing menyimpan salinan hasil unpickle.
+#
+# Konversi dari file .pkl yang ada (dijalankan dari direktori app/):
+#   python -m loader.model_store
+#   python -m loader.model_store air_cleaner televisions
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+
+from .metrics import timed
+from .tree_arrays import to_array_trees
+
+COMPACT_EXTENSION = '.joblib'
+
+
+# Path file ringkas untuk sebuah file .pkl (disimpan di sebelahnya)
+def compact_path(path):
+    return os.path.splitext(path)[0] + COMPACT_EXTENSION
+
+
+# Path file metrik training untuk sebuah file model (ditulis oleh train.py --publish)
+def metrics_path(path):
+    return os.path.splitext(path)[0] + '.metrics.json'
+
+
+# Metrik training sebuah model; None jika model tidak dilatih dengan train.py
+def load_metrics(path):
+    try:
+        with open(metrics_path(path)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+# Hash SHA-256 dari isi file, dibaca per blok agar file besar tidak dimuat utuh ke memori
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Memuat model dari .joblib (memory-mapped, read-only) atau dari .pkl biasa
+@timed('load_model')
+def load_model(path):
+    if path.endswith(COMPACT_EXTENSION):
+        import joblib
+        return joblib.load(path, mmap_mode='r')
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+# Menyimpan model dalam format ringkas. Pohon sklearn diganti dengan ArrayTreeRegressor
+# agar tabel node-nya ikut di-memory-map. File ditulis ke file sementara lalu di-rename,
+# sehingga registry yang sedang berjalan tidak pernah membaca file setengah jadi.
+def export_model(model, path):
+    import joblib
+
+    tmp_path = path + '.tmp'
+    joblib.dump(to_array_trees(model), tmp_path, compress=0)
+    os.replace(tmp_path, path)
+    return path
+
+
+# Fungsi untuk mengonversi file .pkl yang ada ke format ringkas
+def convert(paths):
+    for model_type, path in paths.items():
+        target = compact_path(path)
+        export_model(load_model(path), target)
+        print(f"{model_type}: {path} ({os.path.getsize(path)} bytes) -> {target} ({os.path.getsize(target)} bytes)")
+
+
+def main(argv=None):
+    from .registry import model_paths
+
+    parser = argparse.ArgumentParser(description="Convert .pkl models to memory-mappable .joblib files.")
+    parser.add_argument('models', nargs='*', help=f"Model types to convert (default: all of {', '.join(model_paths)})")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.models if name not in model_paths]
+    if unknown:
+        parser.error(f"Unknown model type(s): {', '.join(unknown)}")
+    convert({name: model_paths[name] for name in (args.models or model_paths)})
+
+
+if __name__ == '__main__':
+    main()
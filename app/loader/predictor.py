@@ -0,0 +1,53 @@
+# app/loader/predictor.py
+#
+# Jalur prediksi bersama untuk model energi yang dilayani dari registry (AC, TV,
+# air cleaner): validasi -> cache hasil -> micro-batcher -> engine pohon terkompilasi
+# atau model.predict sklearn. Semua modul loader dan halaman Streamlit memakai jalur
+# ini, sehingga validasi dan preprocessing tidak berbeda antar tipe model.
+
+from .registry import registry
+from .schema import get_schema
+from .batcher import MicroBatcher
+from .cache import prediction_cache
+from .metrics import timed
+from .tree_engine import get_engine
+
+# Fungsi untuk preprocessing input data menggunakan skema fitur yang dikompilasi dari model
+@timed('preprocess_input')
+def preprocess_input(data, model_type):
+    return get_schema(model_type).frame(data)
+
+# Fungsi untuk menjalankan model.predict (dipisah agar durasinya bisa diukur per tahap)
+@timed('model_predict', rows=lambda model, input_data_processed: len(input_data_processed))
+def model_predict(model, input_data_processed):
+    return model.predict(input_data_processed)
+
+# Fungsi untuk prediksi berdasarkan model yang dipilih. `arrays` adalah hasil
+# FeatureSchema.arrays dari input yang sama jika sudah divalidasi sebelumnya.
+def predict_uncached(model_type, input_data, arrays=None):
+    schema = get_schema(model_type)
+    if arrays is None:
+        arrays = schema.arrays(input_data)
+
+    # Model pohon dievaluasi lewat engine terkompilasi (hasil identik dengan sklearn)
+    engine = get_engine(model_type)
+    if engine is not None:
+        return engine.predict_arrays(arrays)
+
+    # Model diambil dari registry bersama (dimuat sekali, dimuat ulang jika file berubah)
+    model = registry.get(model_type)
+    y_pred = model_predict(model, schema.to_frame(arrays))
+    return y_pred
+
+# Micro-batching untuk request tunggal yang datang bersamaan (None jika tidak aktif)
+micro_batcher = MicroBatcher.from_env(predict_uncached)
+
+# Fungsi untuk prediksi dengan cache hasil (spesifikasi yang sama tidak diprediksi ulang);
+# record yang tidak ada di cache digabung dengan request lain lewat micro-batcher jika aktif
+def predict(model_type, input_data):
+    # Validasi lebih dulu: baris yang tidak valid ditolak (ValidationError dengan error
+    # per baris) sebelum masuk cache, micro-batcher, atau model. Array hasil validasi
+    # diteruskan sampai ke model, jadi input tidak dikonversi dua kali.
+    arrays = get_schema(model_type).valid_arrays(input_data)
+    predict_fn = micro_batcher.predict if micro_batcher is not None else predict_uncached
+    return prediction_cache.predict(model_type, input_data, predict_fn, arrays)
@@ -0,0 +1,227 @@
+# app/loader/price_stats.py
+#
+# Statistik cukup (sufficient statistics) per wilayah untuk model harga rumah, supaya
+# model bisa diperbarui secara inkremental saat listing baru ditambahkan ke CSV:
+# - regresi: AᵀA dan Aᵀy dengan A = [1, fitur...], sehingga koefisien LinearRegression
+#   dihitung ulang dalam bentuk tertutup tanpa membaca ulang data lama
+# - statistik harga: jumlah, total, minimum, maksimum, dan sketch kuantil untuk median
+#   (histogram logaritmik dengan error relatif paling besar SKETCH_ACCURACY)
+#
+# State disimpan sebagai file JSON kecil beserta posisi byte CSV yang sudah diproses
+# dan sha256 seluruh byte sebelum posisi itu. Pembaruan hanya mem-parse byte setelah
+# posisi itu; jika CSV bukan lagi kelanjutan dari yang sudah diproses (ada byte yang
+# berubah di bagian yang sudah dibaca, atau file lebih pendek), state dibangun ulang
+# dari awal.
+
+import hashlib
+import io
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+STATE_VERSION = 2
+SKETCH_ACCURACY = 0.01
+_GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+
+# sha256 dari `length` byte pertama file (objek hashlib, supaya bisa dilanjutkan)
+def _prefix_digest(file, length):
+    digest = hashlib.sha256()
+    file.seek(0)
+    remaining = length
+    while remaining > 0:
+        chunk = file.read(min(1 << 20, remaining))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest
+
+
+class PriceStats:
+    def __init__(self, regions, feature_columns):
+        self.regions = [tuple(region) for region in regions]
+        self.feature_columns = list(feature_columns)
+        n_regions, n_terms = len(self.regions), len(self.feature_columns) + 1
+        self.gram = np.zeros((n_regions, n_terms, n_terms))  # AᵀA, baris/kolom 0 untuk intercept
+        self.moment = np.zeros((n_regions, n_terms))          # Aᵀy
+        self.price_count = np.zeros(n_regions, dtype=np.int64)
+        self.price_sum = np.zeros(n_regions)
+        self.price_min = np.full(n_regions, np.inf)
+        self.price_max = np.full(n_regions, -np.inf)
+        self.sketches = [{} for _ in self.regions]            # indeks bucket -> jumlah
+        self.source = None  # posisi dan sidik jari CSV yang sudah diproses
+
+    # Jumlah baris training regresi per wilayah
+    @property
+    def row_counts(self):
+        return self.gram[:, 0, 0].astype(np.int64)
+
+    # Fungsi untuk menambahkan listing (HARGA sudah numerik, GRS sudah 0/1) ke statistik.
+    # Wilayah regresi dicocokkan dengan str.contains, statistik harga dengan nama
+    # sub-lokasi yang sama persis (sama seperti model yang di-fit dari seluruh data).
+    def add(self, df):
+        df = df.dropna(subset=self.feature_columns + ['HARGA'])
+        # Nama kota dicocokkan per kategori (bukan per baris), lalu dipetakan lewat kode
+        # (kode -1 untuk KOTA kosong menunjuk ke elemen False tambahan di akhir)
+        kota = df['KOTA']
+        if not isinstance(kota.dtype, pd.CategoricalDtype):
+            kota = kota.astype(str).astype('category')
+        names = kota.cat.categories.astype(str)
+        codes = kota.cat.codes.to_numpy()
+        X = df[self.feature_columns].to_numpy(dtype=float)
+        y = df['HARGA'].to_numpy(dtype=float)
+        A = np.column_stack([np.ones(len(X)), X])
+        for i, (lokasi, sub_lokasi) in enumerate(self.regions):
+            in_region = names.str.contains(lokasi, regex=False) & names.str.contains(sub_lokasi, regex=False)
+            rows = np.append(in_region, False)[codes]
+            if rows.any():
+                self.gram[i] += A[rows].T @ A[rows]
+                self.moment[i] += A[rows].T @ y[rows]
+
+            prices = y[np.append(names == sub_lokasi, False)[codes]]
+            if len(prices):
+                self.price_count[i] += len(prices)
+                self.price_sum[i] += prices.sum()
+                self.price_min[i] = min(self.price_min[i], prices.min())
+                self.price_max[i] = max(self.price_max[i], prices.max())
+                keys, counts = np.unique(np.ceil(np.log(np.maximum(prices, 1.0)) / _LOG_GAMMA).astype(np.int64),
+                                         return_counts=True)
+                sketch = self.sketches[i]
+                for key, count in zip(keys.tolist(), counts.tolist()):
+                    sketch[key] = sketch.get(key, 0) + count
+        return len(df)
+
+    # Koefisien dan intercept regresi per wilayah (NaN untuk wilayah tanpa data).
+    # Seperti LinearRegression: data dipusatkan, lalu solusi least squares dengan norma
+    # minimum sehingga kolom yang konstan (misalnya GRS yang selalu 1) mendapat koefisien 0.
+    def coefficients(self):
+        n_regions, n_features = len(self.regions), len(self.feature_columns)
+        coef = np.full((n_regions, n_features), np.nan)
+        intercept = np.full(n_regions, np.nan)
+        for i in np.flatnonzero(self.gram[:, 0, 0] > 0):
+            n = self.gram[i, 0, 0]
+            mean_x = self.gram[i, 0, 1:] / n
+            mean_y = self.moment[i, 0] / n
+            sxx = self.gram[i, 1:, 1:] - n * np.outer(mean_x, mean_x)
+            sxy = self.moment[i, 1:] - n * mean_x * mean_y
+            coef[i] = np.linalg.lstsq(sxx, sxy, rcond=None)[0]
+            intercept[i] = mean_y - mean_x @ coef[i]
+        return coef, intercept
+
+    # Perkiraan harga urutan ke-`k` (dari 0) di wilayah `i` menurut sketch
+    def _order_statistic(self, i, k):
+        seen = 0
+        for key in sorted(self.sketches[i]):
+            seen += self.sketches[i][key]
+            if seen > k:
+                value = 2 * _GAMMA ** key / (_GAMMA + 1)
+                return min(max(value, self.price_min[i]), self.price_max[i])
+        return self.price_max[i]
+
+    # Perkiraan kuantil harga wilayah `i`, diinterpolasi linear antar urutan seperti np.quantile
+    def quantile(self, i, q):
+        count = self.price_count[i]
+        if not count:
+            return np.nan
+        rank = q * (count - 1)
+        lower, upper = math.floor(rank), math.ceil(rank)
+        value = self._order_statistic(i, lower)
+        if upper != lower:
+            value += (rank - lower) * (self._order_statistic(i, upper) - value)
+        return float(value)
+
+    # Statistik harga per wilayah: rata-rata, median (perkiraan), minimum, maksimum
+    def statistics(self):
+        stats = np.full((len(self.regions), 4), np.nan)
+        for i in np.flatnonzero(self.price_count):
+            stats[i] = (self.price_sum[i] / self.price_count[i], self.quantile(i, 0.5),
+                        self.price_min[i], self.price_max[i])
+        return stats
+
+    # Fungsi untuk memproses baris CSV yang ditambahkan sejak pembaruan terakhir.
+    # `parse` mengubah DataFrame mentah hasil read_csv menjadi listing siap pakai.
+    # Mengembalikan jumlah baris baru, atau None jika CSV bukan kelanjutan dari state ini.
+    def fold_csv(self, file_path, parse):
+        with open(file_path, 'rb') as file:
+            header = file.readline()
+            offset = len(header)
+            if self.source is not None:
+                offset = self.source['offset']
+                if os.fstat(file.fileno()).st_size < offset:
+                    return None
+                # Seluruh bagian yang sudah diproses harus sama persis, bukan hanya ukurannya
+                digest = _prefix_digest(file, offset)
+                if digest.hexdigest() != self.source['prefix']:
+                    return None
+            else:
+                digest = hashlib.sha256(header)
+            file.seek(offset)
+            data = file.read()
+
+        # Hanya baris lengkap; baris terakhir yang belum selesai ditulis dibaca di pembaruan berikutnya
+        end = data.rfind(b'\n') + 1
+        rows = 0
+        if data[:end].strip():
+            rows = self.add(parse(pd.read_csv(io.BytesIO(header + data[:end]))))
+        digest.update(data[:end])
+        self.set_source(offset + end, digest.hexdigest(), (self.source or {}).get('rows', 0) + rows)
+        return rows
+
+    # Mencatat bagian CSV yang sudah diproses: `offset` byte pertama dengan sha256 `prefix`
+    def set_source(self, offset, prefix, rows):
+        self.source = {"offset": offset, "prefix": prefix, "rows": rows}
+
+    def to_dict(self):
+        return {
+            "version": STATE_VERSION,
+            "regions": self.regions,
+            "feature_columns": self.feature_columns,
+            "gram": self.gram.tolist(),
+            "moment": self.moment.tolist(),
+            "price_count": self.price_count.tolist(),
+            "price_sum": self.price_sum.tolist(),
+            "price_min": [value if np.isfinite(value) else None for value in self.price_min.tolist()],
+            "price_max": [value if np.isfinite(value) else None for value in self.price_max.tolist()],
+            "sketches": [{str(key): count for key, count in sketch.items()} for sketch in self.sketches],
+            "source": self.source,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls(state['regions'], state['feature_columns'])
+        stats.gram = np.array(state['gram'], dtype=float).reshape(stats.gram.shape)
+        stats.moment = np.array(state['moment'], dtype=float).reshape(stats.moment.shape)
+        stats.price_count = np.array(state['price_count'], dtype=np.int64)
+        stats.price_sum = np.array(state['price_sum'], dtype=float)
+        stats.price_min = np.array([np.inf if value is None else value for value in state['price_min']])
+        stats.price_max = np.array([-np.inf if value is None else value for value in state['price_max']])
+        stats.sketches = [{int(key): count for key, count in sketch.items()} for sketch in state['sketches']]
+        stats.source = state['source']
+        return stats
+
+    # Memuat state dari file; None jika file tidak ada, rusak, atau untuk wilayah/fitur lain
+    @classmethod
+    def load(cls, path, regions, feature_columns):
+        try:
+            with open(path) as file:
+                state = json.load(file)
+            if (state.get('version') != STATE_VERSION
+                    or [tuple(region) for region in state['regions']] != [tuple(region) for region in regions]
+                    or state['feature_columns'] != list(feature_columns)):
+                return None
+            return cls.from_dict(state)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    # Menyimpan state lewat file sementara lalu rename, agar pembaca lain tidak
+    # pernah melihat file setengah jadi
+    def save(self, path):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(self.to_dict(), file)
+        os.replace(tmp_path, path)
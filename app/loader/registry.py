@@ -0,0 +1,128 @@
+# app/loader/registry.py
+
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from .model_store import compact_path, file_digest, load_model
+
+# Paths untuk semua model dan scaler .pkl
+base_path = os.path.dirname(__file__)  # Mengambil path direktori saat ini
+models_dir = os.path.normpath(os.path.join(base_path, '../models-pickle/house-energy'))
+model_paths = {
+    'air_conditioners': os.path.join(models_dir, 'air-conditioners.pkl'),
+    'televisions': os.path.join(models_dir, 'televisions.pkl'),
+    'refrigerators': os.path.join(models_dir, 'refrigerators.pkl'),
+    'air_cleaner': os.path.join(models_dir, 'air-cleaner.pkl'),
+    'scaler': os.path.join(models_dir, 'scalers/scaler.pkl'),
+    'target_scaler': os.path.join(models_dir, 'target_scaler.pkl'),
+}
+
+# Satu entry model yang sudah dimuat; tidak pernah diubah, hanya diganti utuh
+ModelEntry = namedtuple('ModelEntry', ['model', 'version', 'path', 'mtime_ns', 'size', 'checked_at'])
+
+
+class ModelRegistry:
+    # Registry model bersama untuk satu proses:
+    # - model dimuat saat pertama kali diminta (lazy)
+    # - model disimpan di memori dan dipakai bersama antar request dan thread
+    # - file dicek ulang paling sering tiap `check_interval` detik; jika mtime/ukuran
+    #   berubah, isi file di-hash dan model hanya dimuat ulang jika hash-nya berbeda
+    # - jika ada file .joblib hasil `python -m loader.model_store` yang tidak lebih lama
+    #   dari .pkl-nya, file itu yang dimuat (memory-mapped)
+    def __init__(self, paths, check_interval=1.0):
+        self.paths = dict(paths)
+        self.check_interval = check_interval
+        self._entries = {}
+        self._derived = {}
+        self._locks = {key: threading.Lock() for key in self.paths}
+
+    # Mengambil model untuk tipe tertentu
+    def get(self, model_type):
+        return self.entry(model_type).model
+
+    # Versi model (hash SHA-256 dari isi file model)
+    def version(self, model_type):
+        return self.entry(model_type).version
+
+    def entry(self, model_type):
+        if model_type not in self.paths:
+            raise ValueError("Model type not recognized.")
+
+        entry = self._entries.get(model_type)
+        if entry is not None and time.monotonic() - entry.checked_at < self.check_interval:
+            return entry
+
+        with self._locks[model_type]:
+            # Thread lain mungkin sudah memuat/mengecek model selama kita menunggu lock
+            entry = self._entries.get(model_type)
+            if entry is not None and time.monotonic() - entry.checked_at < self.check_interval:
+                return entry
+            entry = self._refresh(model_type, entry)
+            self._entries[model_type] = entry  # Penggantian atomik satu referensi
+            return entry
+
+    # File yang dimuat untuk sebuah model: .joblib jika tersedia dan up to date, jika tidak .pkl
+    def source_path(self, model_type):
+        path = self.paths[model_type]
+        compact = compact_path(path)
+        try:
+            if os.stat(compact).st_mtime_ns >= os.stat(path).st_mtime_ns:
+                return compact
+        except FileNotFoundError:
+            pass
+        return path
+
+    def _refresh(self, model_type, entry):
+        now = time.monotonic()
+        try:
+            path = self.source_path(model_type)
+            stat = os.stat(path)
+            if entry is not None and (path, stat.st_mtime_ns, stat.st_size) == (entry.path, entry.mtime_ns, entry.size):
+                return entry._replace(checked_at=now)
+
+            version = file_digest(path)
+            if entry is not None and (path, version) == (entry.path, entry.version):
+                return entry._replace(mtime_ns=stat.st_mtime_ns, size=stat.st_size, checked_at=now)
+
+            model = load_model(path)
+        except Exception:
+            if entry is None:
+                raise
+            # File sedang ditulis ulang atau rusak: tetap gunakan model lama
+            logging.exception("Failed to reload model '%s', keeping previous version", model_type)
+            return entry._replace(checked_at=now)
+
+        if entry is not None:
+            logging.info("Reloaded model '%s' (%s)", model_type, version[:12])
+        return ModelEntry(model, version, path, stat.st_mtime_ns, stat.st_size, now)
+
+    # Objek turunan dari model (misalnya skema fitur) yang dibangun sekali per versi model
+    def derived(self, model_type, name, factory):
+        entry = self.entry(model_type)
+        cached = self._derived.get((model_type, name))
+        if cached is not None and cached[0] == entry.version:
+            return cached[1]
+        value = factory(entry.model)
+        self._derived[(model_type, name)] = (entry.version, value)
+        return value
+
+    # Memuat semua model sekaligus (misalnya saat startup)
+    def load_all(self):
+        return {key: self.get(key) for key in self.paths}
+
+    # Memaksa model dimuat ulang pada permintaan berikutnya
+    def invalidate(self, model_type=None):
+        if model_type is None:
+            self._entries.clear()
+            self._derived.clear()
+        else:
+            self._entries.pop(model_type, None)
+            for key in [key for key in self._derived if key[0] == model_type]:
+                self._derived.pop(key, None)
+
+
+# Registry bersama untuk semua modul loader
+registry = ModelRegistry(model_paths)
@@ -0,0 +1,156 @@
+# app/loader/rerun_profile.py
+#
+# Profiling opsional untuk siklus rerun Streamlit: setiap interaksi widget menjalankan
+# ulang script halaman dari atas ke bawah, jadi setiap rerun dicatat:
+# - wall time total dan waktu per bagian (misalnya load data, preprocessing, predict);
+#   waktu di luar bagian yang diukur dicatat sebagai 'other'
+# - puncak memori Python (tracemalloc) selama rerun
+# Hasilnya ditampilkan di panel sidebar dan ditulis ke log JSON lines (satu baris per rerun).
+#
+# Catatan: tracemalloc bersifat global per proses. Puncaknya di-reset di awal setiap rerun;
+# jika beberapa sesi melakukan rerun bersamaan, puncak memorinya bercampur. Field
+# `concurrent_reruns` di log mencatat jumlah rerun yang tumpang tindih, dan
+# `peak_reset_by_other` menandai bahwa rerun lain dimulai (dan me-reset puncak) sebelum
+# rerun ini selesai, sehingga traced_peak_bytes hanya mencakup sebagian rerun.
+#
+# Konfigurasi lewat environment variable:
+#   ENABLE_RERUN_PROFILING=1   mengaktifkan profiling (tanpa ini tidak ada overhead)
+#   RERUN_PROFILE_LOG          path file log (default: rerun-profile.jsonl di sebelah halaman)
+#   RERUN_PROFILE_HISTORY      jumlah rerun terakhir per sesi di panel sidebar (default 20)
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+import weakref
+
+PROFILING_ENABLED = os.environ.get('ENABLE_RERUN_PROFILING', '').lower() in ('1', 'true', 'yes', 'on')
+HISTORY_SIZE = int(os.environ.get('RERUN_PROFILE_HISTORY', 20))
+
+_lock = threading.Lock()
+# Rerun yang sedang berjalan di proses ini. WeakSet: rerun dari sesi yang terputus di
+# tengah jalan (finish tidak pernah dipanggil) hilang sendiri saat sesinya dibuang.
+_active = weakref.WeakSet()
+_peak_resets = 0  # jumlah reset puncak tracemalloc di proses ini
+
+
+class RerunProfiler:
+    def __init__(self, page, log_path, session_state):
+        global _peak_resets
+        self.page = page
+        self.log_path = log_path
+        self.session_state = session_state
+        self.sections = {}
+        self.finished = False
+
+        state = session_state.setdefault('_rerun_profile', {"session": uuid.uuid4().hex[:8], "runs": 0,
+                                                             "history": [], "current": None})
+        # Rerun sebelumnya dihentikan Streamlit di tengah jalan (karena ada interaksi baru)
+        if state["current"] is not None and not state["current"].finished:
+            state["current"].finish(interrupted=True, render=False)
+        state["runs"] += 1
+        state["current"] = self
+        self.state = state
+        self.run = state["runs"]
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        with _lock:
+            tracemalloc.reset_peak()
+            _peak_resets += 1
+            self.peak_reset = _peak_resets
+            _active.add(self)
+            for profiler in _active:
+                profiler.concurrent = max(getattr(profiler, 'concurrent', 1), len(_active))
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+
+    # Context manager untuk mengukur satu bagian rerun; bagian dengan nama sama dijumlahkan
+    @contextlib.contextmanager
+    def section(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = self.sections.get(name, 0.0) + time.perf_counter() - started
+
+    def record(self, interrupted=False):
+        wall = time.perf_counter() - self.started
+        current, peak = tracemalloc.get_traced_memory()
+        sections = dict(self.sections)
+        sections['other'] = max(wall - sum(sections.values()), 0.0)
+        return {
+            "timestamp": self.started_at,
+            "page": self.page,
+            "session": self.state["session"],
+            "run": self.run,
+            "wall_seconds": wall,
+            "sections": sections,
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "concurrent_reruns": self.concurrent,
+            "peak_reset_by_other": _peak_resets != self.peak_reset,
+            "interrupted": interrupted,
+        }
+
+    # Fungsi untuk mengakhiri profiling rerun: tulis log dan tampilkan panel sidebar
+    def finish(self, interrupted=False, render=True):
+        if self.finished:
+            return None
+        self.finished = True
+        with _lock:
+            _active.discard(self)
+            record = self.record(interrupted)
+            try:
+                with open(self.log_path, 'a') as file:
+                    file.write(json.dumps(record) + '\n')
+            except OSError as e:
+                logging.warning("Cannot write rerun profile to %s: %s", self.log_path, e)
+
+        history = self.state["history"]
+        history.append(record)
+        del history[:-HISTORY_SIZE]
+        if render:
+            render_sidebar(record, history)
+        return record
+
+
+# Panel sidebar: rerun ini (per bagian) dan riwayat rerun terakhir sesi ini
+def render_sidebar(record, history):
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander(f"Profiling rerun #{record['run']}", expanded=False):
+        st.markdown(f"**Wall time:** {record['wall_seconds'] * 1000:.1f} ms  \n"
+                    f"**Peak memory (tracemalloc):** {record['traced_peak_bytes'] / 2**20:.2f} MB  \n"
+                    f"**Concurrent reruns:** {record['concurrent_reruns']}")
+        st.dataframe(pd.DataFrame({"ms": {name: seconds * 1000 for name, seconds in record['sections'].items()}}))
+        st.line_chart(pd.DataFrame({
+            "wall_ms": [item['wall_seconds'] * 1000 for item in history],
+            "peak_mb": [item['traced_peak_bytes'] / 2**20 for item in history],
+        }, index=[item['run'] for item in history]))
+
+
+class _DisabledProfiler:
+    def section(self, name):
+        return contextlib.nullcontext()
+
+    def finish(self, interrupted=False, render=True):
+        return None
+
+
+# Fungsi untuk memulai profiling satu rerun halaman Streamlit. Dipanggil di awal script
+# halaman; panggil `finish()` di akhir. Tanpa ENABLE_RERUN_PROFILING=1 profiler-nya no-op.
+def start_rerun_profile(page_file):
+    if not PROFILING_ENABLED:
+        return _DisabledProfiler()
+    import streamlit as st
+
+    page = os.path.splitext(os.path.basename(page_file))[0]
+    log_path = os.environ.get('RERUN_PROFILE_LOG') or os.path.join(os.path.dirname(os.path.abspath(page_file)),
+                                                                   'rerun-profile.jsonl')
+    return RerunProfiler(page, log_path, st.session_state)
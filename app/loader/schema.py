@@ -0,0 +1,199 @@
+# app/loader/schema.py
+
+import numpy as np
+import pandas as pd
+
+from .model_store import load_metrics
+from .registry import registry
+
+
+# Fungsi untuk mencari semua OneHotEncoder di dalam pipeline yang sudah di-fit
+def find_encoders(estimator):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    if isinstance(estimator, OneHotEncoder):
+        yield estimator
+    elif isinstance(estimator, Pipeline):
+        for _, step in estimator.steps:
+            yield from find_encoders(step)
+    elif isinstance(estimator, ColumnTransformer):
+        for _, transformer, _ in estimator.transformers_:
+            yield from find_encoders(transformer)
+
+
+class ValidationError(ValueError):
+    # Input tidak valid. `errors` berisi pesan error per baris input (None untuk baris
+    # yang valid), sehingga prediksi batch bisa menolak baris yang salah saja.
+    def __init__(self, errors):
+        self.errors = errors
+        messages = [error for error in errors if error is not None]
+        message = messages[0] if len(errors) == 1 else f"{len(messages)} of {len(errors)} rows are invalid: {messages[0]}"
+        super().__init__(message)
+
+
+# Nilai yang tidak mungkin berupa angka atau kategori: struktur (object/array JSON)
+def _is_structure(value):
+    return isinstance(value, (dict, list, tuple, set))
+
+
+_structure_mask = np.frompyfunc(_is_structure, 1, 1)
+_string_mask = np.frompyfunc(lambda value: isinstance(value, str), 1, 1)
+
+
+# Array object 1 dimensi dari nilai kolom (np.array biasa membuat array 2 dimensi jika
+# nilainya berupa list)
+def _object_array(values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = list(values) if isinstance(values, np.ndarray) else values
+    return array
+
+
+class FeatureSchema:
+    # Skema fitur yang dikompilasi sekali dari model yang sudah di-fit:
+    # - `columns`: urutan kolom persis seperti saat training (feature_names_in_)
+    # - `categories`: kategori OneHotEncoder untuk setiap kolom kategorikal
+    # - `means`: rata-rata training kolom numerik, untuk mengisi nilai yang kosong
+    # Kolom yang kategorinya numerik (atau tidak di-encode) diperlakukan sebagai numerik.
+    def __init__(self, columns, categories, means=None):
+        self.columns = list(columns)
+        self.categories = dict(categories)
+        self.categorical_columns = [col for col in self.columns
+                                    if col in self.categories and self.categories[col].dtype == object]
+        self.numeric_columns = [col for col in self.columns if col not in self.categorical_columns]
+        self._categorical = set(self.categorical_columns)
+        self.is_categorical = [col in self._categorical for col in self.columns]
+        self.means = {col: float(value) for col, value in (means or {}).items() if col in self.numeric_columns}
+
+    @classmethod
+    def from_model(cls, model, means=None):
+        if not hasattr(model, 'feature_names_in_'):
+            raise ValueError("Model has no feature names; cannot build feature schema.")
+        categories = {}
+        for encoder in find_encoders(model):
+            for col, values in zip(encoder.feature_names_in_, encoder.categories_):
+                categories[col] = values
+        return cls(model.feature_names_in_, categories, means)
+
+    # Mengubah input mentah (dictionary, list of dictionary, atau DataFrame) menjadi
+    # array per kolom dengan tipe data sesuai training, dalam urutan `columns`.
+    # Kolom yang tidak ada di input diisi NaN (atau rata-rata training untuk kolom
+    # numerik); kolom tambahan diabaikan. Nilai yang tidak valid menjadi NaN.
+    def arrays(self, data):
+        return self.validate(data)[0]
+
+    # Sama seperti `arrays`, tetapi ValidationError dilempar jika ada baris yang tidak valid
+    def valid_arrays(self, data):
+        columns, errors = self.validate(data)
+        if any(error is not None for error in errors):
+            raise ValidationError(errors)
+        return columns
+
+    # Validasi dan konversi per kolom (bukan per baris). Mengembalikan array per kolom
+    # seperti `arrays` dan pesan error per baris (None jika baris valid):
+    # - kolom numerik: angka atau string angka yang finite
+    # - kolom kategorikal: string
+    # Nilai kosong (kolom tidak ada, None, NaN) selalu valid; record yang bukan
+    # dictionary selalu tidak valid.
+    def validate(self, data):
+        if isinstance(data, dict):
+            if any(isinstance(value, list) for value in data.values()):
+                data = pd.DataFrame(data)  # Format {kolom: [nilai, ...]}
+            else:
+                data = [data]
+
+        not_mapping = []
+        if isinstance(data, pd.DataFrame):
+            n_rows = len(data)
+            def column_values(col):
+                return data[col].to_numpy() if col in data.columns else None
+        else:
+            records = list(data)
+            n_rows = len(records)
+            # Record yang bukan object (misalnya string, angka, null) ditolak per baris
+            not_mapping = [i for i, record in enumerate(records) if not isinstance(record, dict)]
+            for i in not_mapping:
+                records[i] = {}
+            def column_values(col):
+                if not any(col in record for record in records):
+                    return None
+                return [record.get(col) for record in records]
+
+        columns = []
+        invalid = {}  # kolom -> mask baris yang tidak valid
+        for col in self.columns:
+            values = column_values(col)
+            if values is None:
+                if col in self._categorical:
+                    columns.append(np.full(n_rows, np.nan, dtype=object))
+                else:
+                    columns.append(np.full(n_rows, self.means.get(col, np.nan)))
+                continue
+
+            if col in self._categorical:
+                values = _object_array(values)
+                missing = pd.isna(values)
+                bad = ~missing & ~_string_mask(values).astype(bool)
+                values[missing | bad] = np.nan
+            else:
+                try:
+                    # Jalur cepat: angka, string angka dan None langsung dikonversi numpy
+                    values = np.array(values, dtype=np.float64)
+                    if values.ndim != 1:
+                        raise ValueError("Nested values")
+                    missing = np.isnan(values)
+                    bad = np.isinf(values)
+                except (TypeError, ValueError):
+                    raw = _object_array(values)
+                    missing = pd.isna(raw)
+                    structure = ~missing & _structure_mask(raw).astype(bool)
+                    raw[structure] = np.nan
+                    values = np.asarray(pd.to_numeric(raw, errors='coerce'), dtype=np.float64)
+                    bad = structure | (~missing & ~np.isfinite(values))
+                values[missing] = self.means.get(col, np.nan)
+                values[bad] = np.nan
+            if bad.any():
+                invalid[col] = bad
+            columns.append(values)
+
+        errors = [None] * n_rows
+        if invalid:
+            for i in np.flatnonzero(np.logical_or.reduce(list(invalid.values()))):
+                details = [f"{col} (expected {'a string' if col in self._categorical else 'a number'})"
+                           for col, bad in invalid.items() if bad[i]]
+                errors[i] = f"Invalid values for: {', '.join(details)}."
+        for i in not_mapping:
+            errors[i] = "Invalid input data format. Expected JSON object."
+        return columns, errors
+
+    # DataFrame dari hasil `arrays`, untuk model.predict sklearn
+    def to_frame(self, arrays):
+        return pd.DataFrame(dict(zip(self.columns, arrays)), columns=self.columns)
+
+    # Sama seperti `arrays`, tetapi langsung berupa DataFrame
+    def frame(self, data):
+        return self.to_frame(self.arrays(data))
+
+
+# Baris tertentu dari hasil FeatureSchema.arrays
+def select_rows(arrays, rows):
+    rows = np.asarray(rows, dtype=np.intp)
+    return [values[rows] for values in arrays]
+
+
+# Menggabungkan hasil FeatureSchema.arrays dari beberapa input (skema yang sama)
+def concat_arrays(parts):
+    return [np.concatenate(values) for values in zip(*parts)]
+
+
+# Rata-rata training kolom numerik dari metrik train.py (kosong untuk model lama)
+def training_means(model_type):
+    metrics = load_metrics(registry.paths[model_type]) or {}
+    return metrics.get('feature_means') or {}
+
+
+# Fungsi untuk mengambil skema fitur model; dibangun ulang hanya jika model dimuat ulang
+def get_schema(model_type):
+    return registry.derived(model_type, 'schema',
+                            lambda model: FeatureSchema.from_model(model, training_means(model_type)))
@@ -0,0 +1,177 @@
+# app/loader/tree_arrays.py
+
+import copy
+
+import numpy as np
+
+# sklearn dan scipy diimpor di dalam fungsi: modul ini ikut diimpor oleh registry,
+# dan import sklearn (~1 detik) baru perlu saat model benar-benar dimuat atau dikonversi.
+
+
+# Fungsi untuk mengecek apakah pohon sklearn menerima NaN saat prediksi
+# (DecisionTree/RandomForest sejak sklearn 1.3 dengan splitter='best')
+def _supports_missing_values(tree_estimator):
+    support = getattr(tree_estimator, '_support_missing_values', None)
+    if support is None:
+        return False
+    return bool(support(np.full((1, tree_estimator.n_features_in_), np.nan)))
+
+
+class ArrayTreeRegressor:
+    # Pengganti DecisionTreeRegressor/RandomForestRegressor/GradientBoostingRegressor yang
+    # menyimpan semua pohon sebagai beberapa array node datar (numpy biasa). Berbeda dengan
+    # objek Tree Cython milik sklearn yang selalu menyalin tabel node saat di-unpickle,
+    # array ini bisa di-memory-map oleh joblib sehingga dipakai bersama antar proses worker.
+    #
+    # Node daun menunjuk ke dirinya sendiri, sehingga traversal cukup diulang
+    # `max_depth` kali untuk semua baris dan semua pohon sekaligus.
+    #
+    # Nilai bawaan di level kelas menjaga file .joblib lama (sebelum dukungan NaN dan
+    # gradient boosting) tetap bisa dipakai.
+    missing_go_to_left = None  # Arah NaN per node; None jika model tidak menerima NaN
+    learning_rate = None       # None: rata-rata semua pohon; angka: jumlah bertahap (boosting)
+    init_value = 0.0           # Prediksi awal gradient boosting
+
+    def __init__(self, children_left, children_right, feature, threshold, value, roots,
+                 max_depth, n_features_in_, feature_names_in_=None,
+                 missing_go_to_left=None, learning_rate=None, init_value=0.0):
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features_in_
+        if feature_names_in_ is not None:
+            self.feature_names_in_ = feature_names_in_
+        self.missing_go_to_left = missing_go_to_left
+        self.learning_rate = learning_rate
+        self.init_value = init_value
+
+    @classmethod
+    def from_estimator(cls, estimator):
+        from sklearn.dummy import DummyRegressor
+        from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+        from sklearn.tree import DecisionTreeRegressor
+
+        learning_rate, init_value = None, 0.0
+        if isinstance(estimator, DecisionTreeRegressor):
+            trees = [estimator.tree_]
+            allow_nan = _supports_missing_values(estimator)
+        elif isinstance(estimator, RandomForestRegressor):
+            trees = [tree.tree_ for tree in estimator.estimators_]
+            allow_nan = _supports_missing_values(estimator.estimators_[0])
+        elif isinstance(estimator, GradientBoostingRegressor):
+            trees = [tree.tree_ for tree in estimator.estimators_[:, 0]]
+            allow_nan = False
+            learning_rate = float(estimator.learning_rate)
+            if isinstance(estimator.init_, DummyRegressor):
+                init_value = float(np.ravel(estimator.init_.constant_)[0])
+            elif estimator.init_ != 'zero':
+                raise ValueError(f"Cannot convert gradient boosting with init={type(estimator.init_).__name__}.")
+        else:
+            raise ValueError(f"Cannot convert {type(estimator).__name__} to array trees.")
+        if getattr(estimator, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output tree models are supported.")
+
+        children_left, children_right, feature, threshold, value, roots, missing = [], [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            nodes = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+            children_left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            children_right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            value.append(tree.value[:, 0, 0])
+            if allow_nan:
+                missing.append(tree.missing_go_to_left.astype(bool))
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            children_left=np.concatenate(children_left).astype(np.intp),
+            children_right=np.concatenate(children_right).astype(np.intp),
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            value=np.concatenate(value).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features_in_=estimator.n_features_in_,
+            feature_names_in_=getattr(estimator, 'feature_names_in_', None),
+            missing_go_to_left=np.concatenate(missing) if allow_nan else None,
+            learning_rate=learning_rate,
+            init_value=init_value,
+        )
+
+    def __sklearn_is_fitted__(self):
+        return True
+
+    # Indeks node daun untuk setiap baris dan setiap pohon, shape (n_samples, n_trees)
+    def apply(self, X):
+        from scipy import sparse
+
+        if sparse.issparse(X):
+            X = X.toarray()
+        # sklearn membandingkan fitur float32 dengan threshold float64
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[-1]} features, but model is expecting {self.n_features_in_} features as input.")
+        if np.isinf(X).any():
+            raise ValueError("Input X contains infinity or a value too large for dtype('float32').")
+        has_nan = np.isnan(X).any()
+        if has_nan and self.missing_go_to_left is None:
+            raise ValueError("Input X contains NaN.")
+
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            go_left = values <= self.threshold[nodes]
+            if has_nan:
+                go_left = np.where(np.isnan(values), self.missing_go_to_left[nodes], go_left)
+            nodes = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+        return nodes
+
+    # Menggabungkan nilai daun per pohon menjadi prediksi, dengan urutan operasi yang
+    # sama seperti sklearn sehingga hasilnya identik sampai bit terakhir
+    def aggregate(self, leaves):
+        leaf_values = self.value[leaves]
+        if self.learning_rate is not None:
+            # GradientBoostingRegressor: prediksi awal + learning_rate * nilai daun, per tahap
+            y_pred = np.full(leaf_values.shape[0], self.init_value, dtype=np.float64)
+            for tree_index in range(leaf_values.shape[1]):
+                y_pred += self.learning_rate * leaf_values[:, tree_index]
+            return y_pred
+        if leaf_values.shape[1] == 1:
+            return leaf_values[:, 0]
+        # Jumlahkan per pohon secara berurutan seperti RandomForestRegressor.predict
+        y_pred = np.zeros(leaf_values.shape[0], dtype=np.float64)
+        for tree_index in range(leaf_values.shape[1]):
+            y_pred += leaf_values[:, tree_index]
+        y_pred /= leaf_values.shape[1]
+        return y_pred
+
+    def predict(self, X):
+        return self.aggregate(self.apply(X))
+
+
+# Fungsi untuk mengganti estimator pohon (juga step terakhir sebuah Pipeline) dengan
+# ArrayTreeRegressor. Model lain dikembalikan apa adanya.
+def to_array_trees(model):
+    from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.pipeline import Pipeline
+    from sklearn.tree import DecisionTreeRegressor
+
+    if isinstance(model, Pipeline):
+        name, estimator = model.steps[-1]
+        converted = to_array_trees(estimator)
+        if converted is estimator:
+            return model
+        model = copy.copy(model)
+        model.steps = model.steps[:-1] + [(name, converted)]
+        return model
+    if isinstance(model, (DecisionTreeRegressor, RandomForestRegressor, GradientBoostingRegressor)) and getattr(model, 'n_outputs_', 1) == 1:
+        return ArrayTreeRegressor.from_estimator(model)
+    return model
@@ -0,0 +1,246 @@
+# app/loader/tree_engine.py
+#
+# Engine inferensi terkompilasi untuk model energi berbasis pohon (DecisionTree,
+# RandomForest, GradientBoosting), juga yang dibungkus Pipeline dengan OneHotEncoder
+# atau ColumnTransformer.
+#
+# Saat model dimuat, semua pohon diratakan menjadi array node (ArrayTreeRegressor) dan
+# preprocessing one-hot "dilipat" ke dalam pohon: node yang menguji kolom one-hot
+# (kolom asal, kategori) diubah menjadi uji kesamaan kode kategori pada kolom asal.
+# Input cukup dikodekan menjadi satu matriks float32 (nilai numerik atau kode kategori)
+# lewat lookup dictionary yang sudah dihitung sebelumnya, tanpa matriks sparse dan tanpa
+# validasi sklearn di setiap panggilan, lalu semua baris dan semua pohon ditelusuri
+# sekaligus secara vektor.
+#
+# Hasilnya identik dengan model.predict sklearn. Model yang tidak bisa dikompilasi
+# (misalnya regresi linear atau pipeline dengan scaler) tetap memakai sklearn.
+#
+# Konfigurasi lewat environment variable:
+#   ENABLE_TREE_ENGINE=0       mematikan engine (selalu memakai model.predict sklearn)
+#   TREE_ENGINE_MAX_WORK       batas baris x jumlah pohon per panggilan (default 50000);
+#                              batch yang lebih besar diprediksi oleh sklearn, karena untuk
+#                              batch besar traversal Cython lebih cepat daripada numpy
+
+import logging
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .metrics import timed
+from .registry import registry
+from .schema import FeatureSchema, get_schema
+from .tree_arrays import ArrayTreeRegressor
+
+ENGINE_ENABLED = os.environ.get('ENABLE_TREE_ENGINE', '1').lower() in ('1', 'true', 'yes', 'on')
+MAX_WORK = int(os.environ.get('TREE_ENGINE_MAX_WORK', 50000))
+
+# Satu kolom pada matriks hasil encoding: nilai numerik dari kolom input (lookup None)
+# atau kode kategori dari kolom input menurut satu OneHotEncoder
+Slot = namedtuple('Slot', ['column', 'lookup', 'nan_code', 'categories', 'strict'])
+
+
+def _is_passthrough(step):
+    return step is None or (isinstance(step, str) and step == 'passthrough')
+
+
+# Fungsi untuk menerjemahkan pilihan kolom ColumnTransformer (nama, indeks, slice,
+# atau mask boolean) menjadi posisi kolom input transformer tersebut
+def _selected_columns(transformer, selection, n_inputs):
+    names = list(getattr(transformer, 'feature_names_in_', []))
+    if isinstance(selection, slice):
+        start, stop = selection.start, selection.stop
+        if isinstance(start, str):
+            start = names.index(start)
+        if isinstance(stop, str):
+            stop = names.index(stop) + 1  # Slice nama kolom bersifat inklusif
+        return list(range(n_inputs))[slice(start, stop, selection.step)]
+    selection = np.atleast_1d(np.asarray(selection))
+    if selection.dtype == bool:
+        return [int(i) for i in np.flatnonzero(selection)]
+    if selection.dtype.kind in 'iu':
+        return [int(i) for i in selection]
+    return [names.index(name) for name in selection]
+
+
+class _Encoding:
+    # Membangun daftar slot dan, untuk setiap fitur keluaran preprocessing, pasangan
+    # (slot, kode kategori) yang menghasilkan fitur itu (kode -1 untuk fitur numerik)
+    def __init__(self):
+        self.slots = []
+        self._slot_ids = {}
+
+    def _slot(self, column, encoder=None, categories=None):
+        key = (column, id(encoder) if encoder is not None else None)
+        if key not in self._slot_ids:
+            if encoder is None:
+                slot = Slot(column, None, -1, None, False)
+            else:
+                missing = [code for code, category in enumerate(categories) if pd.isna(category)]
+                lookup = {category: code for code, category in enumerate(categories) if not pd.isna(category)}
+                slot = Slot(column, lookup, missing[0] if missing else -1, categories,
+                            encoder.handle_unknown == 'error')
+            self._slot_ids[key] = len(self.slots)
+            self.slots.append(slot)
+        return self._slot_ids[key]
+
+    def features(self, transformer, columns):
+        from sklearn.compose import ColumnTransformer
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import OneHotEncoder
+
+        if _is_passthrough(transformer):
+            return [(self._slot(column), -1) for column in columns]
+        if isinstance(transformer, str) and transformer == 'drop':
+            return []
+
+        if isinstance(transformer, Pipeline):
+            steps = [step for _, step in transformer.steps if not _is_passthrough(step)]
+            if len(steps) > 1:
+                raise ValueError("Pipelines with more than one preprocessing step cannot be compiled.")
+            return self.features(steps[0] if steps else 'passthrough', columns)
+
+        if isinstance(transformer, ColumnTransformer):
+            features = []
+            for _, step, selection in transformer.transformers_:
+                selected = _selected_columns(transformer, selection, len(columns))
+                if selected:
+                    features.extend(self.features(step, [columns[i] for i in selected]))
+            return features
+
+        if isinstance(transformer, OneHotEncoder):
+            if getattr(transformer, '_infrequent_enabled', False):
+                raise ValueError("OneHotEncoder with infrequent categories cannot be compiled.")
+            if len(transformer.categories_) != len(columns):
+                raise ValueError("OneHotEncoder input does not match the selected columns.")
+            drop_idx = transformer.drop_idx_
+            features = []
+            for i, (column, categories) in enumerate(zip(columns, transformer.categories_)):
+                slot = self._slot(column, transformer, categories)
+                dropped = drop_idx[i] if drop_idx is not None else None
+                features.extend((slot, code) for code in range(len(categories)) if code != dropped)
+            return features
+
+        raise ValueError(f"{type(transformer).__name__} cannot be compiled into the tree engine.")
+
+
+class CompiledTreeModel:
+    # Model pohon terkompilasi: encoding input + array node dengan fitur yang sudah
+    # dipetakan ulang ke slot encoding
+    def __init__(self, model, schema, slots, features, trees):
+        self.model = model
+        self.schema = schema
+        self.slots = slots
+        self.trees = trees
+
+        feature_slot = np.array([slot for slot, _ in features], dtype=np.intp)
+        feature_code = np.array([code for _, code in features], dtype=np.float32)
+        is_leaf = trees.children_left == np.arange(len(trees.children_left))
+
+        self.node_slot = feature_slot[trees.feature]
+        self.node_code = feature_code[trees.feature]
+        self.node_is_category = (self.node_code >= 0) & ~is_leaf
+        self.has_category = bool(self.node_is_category.any())
+        # Jika semua node split menguji kategori, nilai fitur cukup berupa hasil perbandingan kode
+        self.all_category = bool(self.node_is_category[~is_leaf].all())
+        self.numeric_slots = [j for j, slot in enumerate(slots) if slot.lookup is None]
+        self.allow_nan = trees.missing_go_to_left is not None
+
+    # Mengubah array per kolom (hasil FeatureSchema.arrays) menjadi matriks float32
+    @timed('engine_encode')
+    def encode(self, arrays):
+        X = np.empty((len(arrays[0]), len(self.slots)), dtype=np.float32)
+        for j, slot in enumerate(self.slots):
+            values = arrays[slot.column]
+            if slot.lookup is None:
+                X[:, j] = values
+                continue
+            lookup, nan_code = slot.lookup, slot.nan_code
+            codes = [lookup.get(value, -1) if value == value else nan_code for value in values]
+            if slot.strict and -1 in codes:
+                unknown = sorted({str(value) for value, code in zip(values, codes) if code == -1})
+                raise ValueError(f"Found unknown categories {unknown} in column "
+                                 f"'{self.schema.columns[slot.column]}' during transform")
+            X[:, j] = codes
+
+        if self.numeric_slots:
+            numeric = X[:, self.numeric_slots]
+            if np.isinf(numeric).any():
+                raise ValueError("Input X contains infinity or a value too large for dtype('float32').")
+            if not self.allow_nan and np.isnan(numeric).any():
+                raise ValueError("Input X contains NaN.")
+        return X
+
+    # Indeks node daun untuk setiap baris dan setiap pohon, shape (n_samples, n_trees)
+    def apply(self, X):
+        trees = self.trees
+        has_nan = self.allow_nan and bool(np.isnan(X).any())
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(trees.roots, (X.shape[0], len(trees.roots)))
+        for _ in range(trees.max_depth):
+            values = X[rows, self.node_slot[nodes]]
+            if self.has_category:
+                # Nilai fitur one-hot (0/1) dihitung langsung dari kode kategori
+                matches = values == self.node_code[nodes]
+                values = matches if self.all_category else np.where(self.node_is_category[nodes], matches, values)
+            go_left = values <= trees.threshold[nodes]
+            if has_nan:
+                go_left = np.where(np.isnan(values), trees.missing_go_to_left[nodes], go_left)
+            nodes = np.where(go_left, trees.children_left[nodes], trees.children_right[nodes])
+        return nodes
+
+    @timed('engine_predict', rows=lambda self, X: len(X))
+    def predict_encoded(self, X):
+        return self.trees.aggregate(self.apply(X))
+
+    # Prediksi dari input mentah (dictionary, list of dictionary, atau DataFrame)
+    def predict(self, data):
+        return self.predict_arrays(self.schema.arrays(data))
+
+    # Prediksi dari array per kolom (hasil FeatureSchema.arrays skema engine ini)
+    def predict_arrays(self, arrays):
+        if len(arrays[0]) * len(self.trees.roots) > MAX_WORK:
+            return self.model.predict(self.schema.to_frame(arrays))
+        return self.predict_encoded(self.encode(arrays))
+
+
+# Fungsi untuk mengompilasi model pohon (atau Pipeline berakhiran model pohon);
+# ValueError jika model atau preprocessing-nya tidak didukung. `schema` adalah skema
+# fitur model (misalnya dari get_schema, dengan rata-rata training untuk nilai kosong);
+# jika tidak diberikan, skema dibangun dari model tanpa rata-rata training.
+def compile_model(model, schema=None):
+    from sklearn.pipeline import Pipeline
+
+    steps = []
+    estimator = model
+    if isinstance(model, Pipeline):
+        steps = [step for _, step in model.steps[:-1] if not _is_passthrough(step)]
+        estimator = model.steps[-1][1]
+    if len(steps) > 1:
+        raise ValueError("Pipelines with more than one preprocessing step cannot be compiled.")
+    trees = estimator if isinstance(estimator, ArrayTreeRegressor) else ArrayTreeRegressor.from_estimator(estimator)
+
+    schema = schema or FeatureSchema.from_model(model)
+    encoding = _Encoding()
+    features = encoding.features(steps[0] if steps else 'passthrough', list(range(len(schema.columns))))
+    if len(features) != trees.n_features_in_:
+        raise ValueError(f"Preprocessing produces {len(features)} features, "
+                         f"but the trees expect {trees.n_features_in_}.")
+    return CompiledTreeModel(model, schema, encoding.slots, features, trees)
+
+
+def _compile_or_none(model, schema=None):
+    try:
+        return compile_model(model, schema)
+    except ValueError as e:
+        logging.info("Tree engine not used for %s: %s", type(model).__name__, e)
+        return None
+
+
+# Fungsi untuk mengambil engine terkompilasi sebuah model (dibangun sekali per versi
+# model); None jika engine tidak aktif atau model tidak bisa dikompilasi
+def get_engine(model_type):
+    if not ENGINE_ENABLED:
+        return None
+    return registry.derived(model_type, 'tree_engine', lambda model: _compile_or_none(model, get_schema(model_type)))
@@ -0,0 +1,113 @@
+# app/loader/warmup.py
+#
+# Prewarm: memuat semua model dan menjalankan satu prediksi uji per model sebelum
+# worker dinyatakan siap, sehingga request pertama tidak menanggung biaya import
+# sklearn, unpickle, kompilasi skema/engine pohon, dan pembangunan model harga rumah.
+# Hasilnya berupa laporan waktu startup (import, load dan prediksi uji per model).
+#
+# Laporan untuk proses baru (dijalankan dari direktori app/):
+#   python -m loader.warmup
+
+import importlib
+import json
+import logging
+import time
+
+# Modul loader lain diimpor di dalam fungsi, supaya `python -m loader.warmup` bisa
+# mengukur biaya import-nya sendiri.
+
+
+# Satu record contoh dari skema fitur model: kategori pertama yang dikenal untuk
+# kolom kategorikal, 0 untuk kolom numerik
+def sample_record(schema):
+    import pandas as pd
+
+    record = {}
+    for col in schema.columns:
+        categories = schema.categories.get(col)
+        known = [] if categories is None else [value for value in categories if not pd.isna(value)]
+        record[col] = known[0] if known else 0.0
+    return record
+
+
+# Prediksi uji untuk setiap model yang dipakai langsung; model lain (scaler) cukup dimuat
+def _test_predictions():
+    from .predictor import predict_uncached
+    from .load_refrigerator import predict_refrigerator_energy_consumption
+    from .schema import get_schema
+
+    def tree_model(model_type):
+        return lambda: predict_uncached(model_type, [sample_record(get_schema(model_type))])
+
+    return {
+        'air_conditioners': tree_model('air_conditioners'),
+        'televisions': tree_model('televisions'),
+        'air_cleaner': tree_model('air_cleaner'),
+        'refrigerators': lambda: predict_refrigerator_energy_consumption([{}]),
+    }
+
+
+def _predict_house_price():
+    from .house_price import get_model
+
+    model = get_model()
+    lokasi, sub_lokasi = next(region for region in model.regions if model.has_data(*region))
+    return model.predict_batch([{'lokasi': lokasi, 'sub_lokasi': sub_lokasi,
+                                 'LT': 100, 'LB': 100, 'JKT': 2, 'JKM': 1, 'GRS': 1}])
+
+
+# Fungsi untuk memuat dan menguji semua model. Error per model dicatat di laporan;
+# jika `strict`, RuntimeError dilempar setelah semua model dicoba. Dengan
+# house_price=False hanya model energi yang dimuat (misalnya untuk UI house-energy).
+def prewarm(import_seconds=None, strict=True, house_price=True):
+    from .model_store import load_metrics
+    from .registry import registry
+
+    started = time.perf_counter()
+    report = {"import_seconds": import_seconds, "models": {}, "errors": {}}
+    test_predictions = _test_predictions()
+
+    for model_type in registry.paths:
+        timings = report["models"][model_type] = {}
+        try:
+            t0 = time.perf_counter()
+            registry.get(model_type)
+            timings["load_seconds"] = time.perf_counter() - t0
+            training = load_metrics(registry.paths[model_type])
+            if training is not None:
+                timings["training"] = {key: training.get(key) for key in ('version', 'selected', 'created_at')}
+            if model_type in test_predictions:
+                t0 = time.perf_counter()
+                test_predictions[model_type]()
+                timings["predict_seconds"] = time.perf_counter() - t0
+        except Exception as e:
+            report["errors"][model_type] = f"{type(e).__name__}: {e}"
+
+    if house_price:
+        timings = report["models"]["house_price"] = {}
+        try:
+            t0 = time.perf_counter()
+            _predict_house_price()
+            timings["load_seconds"] = time.perf_counter() - t0
+        except Exception as e:
+            report["errors"]["house_price"] = f"{type(e).__name__}: {e}"
+
+    report["warmup_seconds"] = time.perf_counter() - started
+    report["total_seconds"] = report["warmup_seconds"] + (import_seconds or 0.0)
+    logging.info("Startup report: %s", json.dumps(report))
+    if strict and report["errors"]:
+        raise RuntimeError(f"Prewarm failed for: {', '.join(report['errors'])}")
+    return report
+
+
+def main():
+    # Waktu import (import_seconds di laporan) diukur dari modul loader yang dipakai
+    # app.py; household dan house_price ikut mengimpor semua modul prediksi lain
+    started = time.perf_counter()
+    for module in ('household', 'house_price'):
+        importlib.import_module(f'.{module}', __package__)
+    print(json.dumps(prewarm(import_seconds=time.perf_counter() - started, strict=False), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+# app/serve.py
+#
+# Mode serving produksi (pre-fork): proses induk memuat dan menguji semua model sekali
+# (prewarm), lalu fork N worker yang berbagi satu socket listen. Model yang sudah dimuat
+# di induk dipakai bersama oleh semua worker lewat copy-on-write, sehingga memori model
+# tidak digandakan per worker dan setiap worker bisa memakai satu core untuk model.predict.
+# Setiap worker melayani request dengan thread pool berukuran tetap.
+#
+# Reload tanpa downtime: induk mengecek file model (dan CSV harga rumah) secara berkala,
+# atau langsung saat menerima SIGHUP. Jika ada yang berubah, induk memuat ulang dan
+# menguji model, fork generasi worker baru, lalu menghentikan worker lama dengan SIGTERM
+# (worker lama berhenti menerima koneksi dan menyelesaikan request yang sedang berjalan).
+# Jika prewarm model baru gagal, worker lama tetap berjalan.
+#
+# Readiness: GET /ready di setiap worker (lihat app.py).
+#
+# Menjalankan (dari direktori app/):
+#   python serve.py --workers 4 --threads 4 --port 5000
+#
+# Konfigurasi lewat argumen atau environment variable:
+#   SERVE_HOST / SERVE_PORT     alamat listen (default 127.0.0.1:5000)
+#   SERVE_WORKERS               jumlah proses worker (default jumlah CPU)
+#   SERVE_THREADS               thread per worker (default 4)
+#   SERVE_RELOAD_INTERVAL       interval cek perubahan model dalam detik (default 5, 0 = hanya SIGHUP)
+#   SERVE_GRACEFUL_TIMEOUT      waktu tunggu worker lama berhenti sebelum di-kill (default 30)
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer
+
+from app import app, get_house_price_model, prewarm_app
+from loader.registry import registry
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    # Server WSGI Werkzeug yang melayani koneksi di thread pool berukuran tetap
+    multithread = True
+
+    def __init__(self, *args, threads, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='serve')
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+# Sidik jari semua model yang dilayani. Pemanggilan ini juga memuat ulang model di
+# induk jika filenya berubah (registry dan get_model mengecek mtime/hash file).
+def model_fingerprint():
+    return tuple(registry.version(model_type) for model_type in registry.paths), get_house_price_model().source
+
+
+# Proses worker: melayani request sampai menerima SIGTERM/SIGINT, lalu berhenti dengan rapi
+def run_worker(listener, threads):
+    # Worker memakai model milik induk; perubahan model ditangani induk dengan generasi baru
+    registry.check_interval = float('inf')
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.set())
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+    host, port = listener.getsockname()[:2]
+    server = PooledWSGIServer(host, port, app, fd=listener.fileno(), threads=threads)
+    # Non-blocking: worker yang kalah berebut accept() langsung kembali menunggu
+    server.socket.setblocking(False)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.5}, daemon=True)
+    thread.start()
+    stopping.wait()
+
+    server.shutdown()
+    server.executor.shutdown(wait=True)
+    server.server_close()
+
+
+class Arbiter:
+    # Proses induk: fork worker, menjaga jumlahnya, dan reload saat model berubah
+    def __init__(self, listener, workers, threads, reload_interval, graceful_timeout):
+        self.listener = listener
+        self.workers = workers
+        self.threads = threads
+        self.reload_interval = reload_interval
+        self.graceful_timeout = graceful_timeout
+        self.generation = 0
+        self.children = {}  # pid -> generasi
+        self.fingerprint = None
+        self.signals = []
+        self.wakeup = threading.Event()
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                run_worker(self.listener, self.threads)
+            except BaseException:
+                logging.exception("Worker %s crashed", os.getpid())
+                status = 1
+            finally:
+                os._exit(status)
+        self.children[pid] = self.generation
+        return pid
+
+    # Generasi worker baru dari model yang sedang dimuat induk
+    def start_generation(self):
+        self.generation += 1
+        # Objek yang sudah ada dipindah ke generasi permanen GC supaya siklus GC di worker
+        # tidak menyentuh (dan menyalin) halaman memori model milik induk
+        gc.collect()
+        gc.freeze()
+        for _ in range(self.workers):
+            self.spawn()
+        logging.info("Started generation %d: %d workers x %d threads on %s:%s", self.generation,
+                     self.workers, self.threads, *self.listener.getsockname()[:2])
+
+    def stop_generation(self, generation):
+        pids = [pid for pid, gen in self.children.items() if gen == generation]
+        for pid in pids:
+            self.kill(pid, signal.SIGTERM)
+        self.reap(pids, self.graceful_timeout)
+
+    def kill(self, pid, sig):
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    # Menunggu worker tertentu berhenti; yang masih berjalan setelah `timeout` di-kill
+    def reap(self, pids, timeout):
+        deadline = time.monotonic() + timeout
+        pending = set(pids)
+        while pending and time.monotonic() < deadline:
+            for pid in list(pending):
+                try:
+                    done = os.waitpid(pid, os.WNOHANG)[0] == pid
+                except ChildProcessError:
+                    done = True
+                if done:
+                    pending.discard(pid)
+                    self.children.pop(pid, None)
+            time.sleep(0.05)
+        for pid in pending:
+            logging.warning("Worker %s did not stop within %ss, killing", pid, timeout)
+            self.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.children.pop(pid, None)
+
+    # Memuat ulang dan menguji model; jika berhasil, worker diganti dengan generasi baru
+    def reload(self, force=False):
+        try:
+            fingerprint = model_fingerprint()
+            if not force and fingerprint == self.fingerprint:
+                return
+            gc.unfreeze()
+            prewarm_app()
+        except Exception:
+            logging.exception("Reload failed, keeping current workers")
+            return
+        self.fingerprint = fingerprint
+        old_generation = self.generation
+        self.start_generation()
+        self.stop_generation(old_generation)
+
+    # Mengganti worker yang mati tidak terduga (generasi saat ini saja)
+    def respawn_dead(self):
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if self.children.pop(pid, None) == self.generation:
+                logging.warning("Worker %s exited with status %s, restarting", pid, status)
+                self.spawn()
+
+    def run(self):
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, lambda signum, frame: (self.signals.append(signum), self.wakeup.set()))
+        signal.signal(signal.SIGCHLD, lambda signum, frame: self.wakeup.set())
+
+        self.fingerprint = model_fingerprint()
+        self.start_generation()
+        next_check = time.monotonic() + self.reload_interval
+        while True:
+            self.wakeup.wait(timeout=1.0)
+            self.wakeup.clear()
+            while self.signals:
+                signum = self.signals.pop(0)
+                if signum == signal.SIGHUP:
+                    logging.info("SIGHUP received, reloading models")
+                    self.reload(force=True)
+                else:
+                    logging.info("Shutting down %d workers", len(self.children))
+                    self.stop_generation(self.generation)
+                    return
+            self.respawn_dead()
+            if self.reload_interval and time.monotonic() >= next_check:
+                self.reload()
+                next_check = time.monotonic() + self.reload_interval
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fork production server for the prediction API.")
+    parser.add_argument('--host', default=os.environ.get('SERVE_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('SERVE_PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SERVE_WORKERS', os.cpu_count() or 1)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('SERVE_THREADS', 4)))
+    parser.add_argument('--reload-interval', type=float, default=float(os.environ.get('SERVE_RELOAD_INTERVAL', 5)),
+                        help="Seconds between model change checks (0 = reload only on SIGHUP)")
+    parser.add_argument('--graceful-timeout', type=float, default=float(os.environ.get('SERVE_GRACEFUL_TIMEOUT', 30)))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(process)d] %(levelname)s %(message)s')
+    # Prewarm di induk sebelum fork; gagal berarti server tidak dijalankan
+    prewarm_app()
+
+    listener = socket.create_server((args.host, args.port), backlog=1024)
+    listener.set_inheritable(True)
+    arbiter = Arbiter(listener, max(1, args.workers), max(1, args.threads), args.reload_interval,
+                      args.graceful_timeout)
+    try:
+        arbiter.run()
+    finally:
+        listener.close()
+
+
+if __name__ == '__main__':
+    main()
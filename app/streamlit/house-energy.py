@@ -1,77 +1,30 @@
-import requests
-import subprocess
 import streamlit as st
-import pickle
 import pandas as pd
 import os
+import sys
 
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-
-# Paths untuk model .pkl
+# Menambahkan direktori app ke sys.path agar package loader dapat diimpor
 base_path = os.path.dirname(__file__)  # Mengambil path direktori saat ini
-model_paths = {
-    'air_conditioners': os.path.join(base_path, 'air-conditioners.pkl'),
-}
-
-# Fungsi untuk memuat semua model
-def load_models():
-    models = {}
-    for key, path in model_paths.items():
-        with open(path, 'rb') as file:
-            models[key] = pickle.load(file)
-    return models
-
-# Fungsi untuk memproses input data sesuai dengan tipe model
-def preprocess_input(data, model_type):
-    # Definisi kolom numerik dan kategorikal untuk masing-masing tipe model
-    numeric_columns = {
-        'air_conditioners': ['height_inches', 'width_inches', 'depth_inches', 'weight_lbs',
-                             'cooling_capacity_btu_hour', 'voltage_volts'],
-        'televisions': ['Diagonal Viewable Screen Size (in.)', 'Physical Data Ports Available'],
-        # Tambahkan kolom numerik sesuai dengan model lainnya jika diperlukan
-    }
-    
-    categorical_columns = {
-        'air_conditioners': ['type', 'installation_mounting_type', 'heating_mode', 'low_noise'],
-        'televisions': ['Resolution Format', 'Display Type', 'Backlight Technology Type', 
-                        'High Contrast Ratio (HCR) Display', 'Ethernet Supported',
-                        'Low Power Wireless Technologies Supported', 'Automatic Brightness Control', 
-                        'Auto Brightness'],
-        # Tambahkan kolom kategorikal sesuai dengan model lainnya jika diperlukan
-    }
-    
-    if model_type not in numeric_columns or model_type not in categorical_columns:
-        raise ValueError("Model type not recognized.")
+sys.path.insert(0, os.path.join(base_path, '..'))
 
-    # Menambahkan kolom yang hilang dengan nilai default atau rata-rata
-    for col in numeric_columns[model_type]:
-        if col not in data.columns:
-            data[col] = data[col].mean()  # Gunakan nilai rerata dari data training
-    
-    # Memastikan urutan kolom sesuai dengan yang diharapkan
-    expected_columns = numeric_columns[model_type] + categorical_columns[model_type]
-    data = data[expected_columns]
-    
-    return data
+from loader.load_ac import predict_energy_consumption
+from loader.load_tv import predict_tv_energy_consumption
+from loader.schema import get_schema
+from loader.warmup import prewarm
+from loader.rerun_profile import start_rerun_profile
 
-# Fungsi untuk prediksi berdasarkan model yang dipilih
-def predict(model_type, input_data):
-    models = load_models()
-    
-    # Preprocessing input data
-    input_data_processed = preprocess_input(input_data.copy(), model_type)
-    
-    # Prediksi menggunakan model yang sesuai
-    if model_type in models:
-        model = models[model_type]
-        y_pred = model.predict(input_data_processed)
-        return y_pred
-    else:
-        raise ValueError("Model type not recognized.")
+# Semua model energi dimuat dan diuji sekali per proses server Streamlit (bukan di setiap
+# rerun); model harga rumah tidak dipakai halaman ini sehingga tidak ikut dimuat
+@st.cache_resource
+def prewarm_models():
+    return prewarm(house_price=False)
 
 # Streamlit UI untuk input spesifikasi perangkat elektronik
-def streamlit_ui():
+# (`profiler` mengukur bagian-bagian rerun jika ENABLE_RERUN_PROFILING=1)
+def streamlit_ui(profiler):
     st.set_page_config(page_title='Prediksi Konsumsi Listrik Rumah', page_icon=':electric_plug:')
+    with profiler.section('prewarm_models'):
+        prewarm_models()
     
     st.title('Prediksi Konsumsi Listrik Rumah')
     st.markdown(
@@ -120,17 +73,20 @@ def streamlit_ui():
             }
 
             try:
-                result_ac = predict('air_conditioners', pd.DataFrame(input_data))
+                with profiler.section('predict'):
+                    result_ac = predict_energy_consumption(pd.DataFrame(input_data))
                 st.success(f'Prediksi Konsumsi Listrik: {result_ac} kWh/tahun')
             except ValueError as e:
                 st.error(f'Error dalam melakukan prediksi: {e}')
-            except requests.exceptions.RequestException as e:
-                st.error(f'Terdapat kesalahan dalam koneksi: {e}')
 
     elif appliance_type == 'TV':
         diagonal_size_inches = st.number_input('Ukuran Layar Diagonal (in.)', min_value=0.0)
         resolution_format = st.selectbox('Format Resolusi', ['HD', 'Full HD', '4K', '8K'])
-        physical_ports = st.number_input('Jumlah Port Fisik yang Tersedia', min_value=0)
+        # Port fisik adalah kolom kategorikal (kombinasi jenis port), jadi pilihannya
+        # diambil dari kategori yang dikenal model
+        physical_ports = st.selectbox('Port Fisik yang Tersedia',
+                                      [value for value in get_schema('televisions').categories['Physical Data Ports Available']
+                                       if isinstance(value, str)])
         brand_name = st.text_input('Nama Brand')
         display_type = st.selectbox('Tipe Display', ['LED', 'OLED', 'LCD', 'Plasma'])
         backlight_technology = st.selectbox('Teknologi Backlight', ['Direct LED', 'Edge LED', 'Full Array LED', 'Local Dimming'])
@@ -157,12 +113,11 @@ def streamlit_ui():
             }
 
             try:
-                result_tv = predict('televisions', pd.DataFrame(input_data))
+                with profiler.section('predict'):
+                    result_tv = predict_tv_energy_consumption(pd.DataFrame(input_data))
                 st.success(f'Prediksi Konsumsi Listrik: {result_tv} kWh/tahun')
             except ValueError as e:
                 st.error(f'Error dalam melakukan prediksi: {e}')
-            except requests.exceptions.RequestException as e:
-                st.error(f'Terdapat kesalahan dalam koneksi: {e}')
 
     else:
         st.warning('Fitur untuk perangkat selain AC dan TV belum tersedia.')
@@ -170,4 +125,6 @@ def streamlit_ui():
 # Main program untuk menjalankan aplikasi Streamlit
 if __name__ == '__main__':
     # Menjalankan aplikasi Streamlit
-    streamlit_ui()
+    profiler = start_rerun_profile(__file__)
+    streamlit_ui(profiler)
+    profiler.finish()
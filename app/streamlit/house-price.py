@@ -1,48 +1,23 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from sklearn.linear_model import LinearRegression
-
-import os
-import streamlit as st
-import pandas as pd
-import numpy as np
-from sklearn.linear_model import LinearRegression
 import os
+import sys
 
+# Menambahkan direktori app ke sys.path agar package loader dapat diimpor
 base_path = os.path.dirname(__file__)
-# Path untuk file CSV
-csv_file_path = os.path.join(base_path, 'Harga-Rumah-Model.csv')
-
-# Load data CSV
-@st.cache(persist=True)
-def load_data(file_path):
-    return pd.read_csv(file_path)
-
-# Load data
-df = load_data(csv_file_path)
-
+sys.path.insert(0, os.path.join(base_path, '..'))
 
-# Mapping sub-lokasi berdasarkan kota
-sub_lokasi_dict = {
-    'Jakarta': ['Jakarta Utara', 'Jakarta Barat', 'Jakarta Selatan', 'Jakarta Timur', 'Jakarta Pusat'],
-    'Bogor': ['Bogor Utara', 'Bogor Selatan', 'Bogor Timur', 'Bogor Barat', 'Bogor Tengah'],
-    'Tangerang': ['Tangerang Kota', 'Tangerang Selatan', 'Tangerang Utara', 'Tangerang Barat'],
-    'Depok': ['Depok'],
-    'Bekasi': ['Bekasi Barat', 'Bekasi Timur', 'Bekasi Utara', 'Bekasi Selatan']
-}
+from loader.house_price import get_model, sub_lokasi_dict
+from loader.rerun_profile import start_rerun_profile
 
-# Ubah nilai 'GRS' menjadi numerik
-df['GRS'] = df['GRS'].map({'ADA': 1, 'TIDAK ADA': 0})
+# Profiling per rerun (aktif jika ENABLE_RERUN_PROFILING=1)
+profiler = start_rerun_profile(__file__)
 
-# Fungsi untuk preprocessing kolom HARGA
-def preprocess_harga(harga_str):
-    # Hapus titik sebagai pemisah ribuan dan konversi ke float
-    harga_clean = harga_str.replace('.', '')
-    return float(harga_clean)
+# Path untuk file CSV
+csv_file_path = os.path.join(base_path, 'Harga-Rumah-Model.csv')
 
-# Preprocessing kolom HARGA
-df['HARGA'] = df['HARGA'].apply(preprocess_harga)
+# Model harga rumah dimuat sekali per proses dan dibangun ulang otomatis jika CSV berubah
+with profiler.section('load_model'):
+    model = get_model(csv_file_path)
 
 # Sidebar Informasi Program
 st.sidebar.title("Informasi Program")
@@ -94,37 +69,21 @@ garasi = 1 if garasi == 'Ya' else 0
 
 # Tombol Prediksi
 if st.button('Prediksi Harga'):
-    # Filtering Data Berdasarkan Lokasi dan Sub-Lokasi
-    df_filtered = df[(df['KOTA'].str.contains(sub_lokasi)) & (df['KOTA'].str.contains(lokasi))]
-
     # Pastikan data yang ditemukan tidak kosong
-    if df_filtered.empty:
+    if not model.has_data(lokasi, sub_lokasi):
         st.error(f"Tidak ada data yang ditemukan untuk sub-lokasi '{sub_lokasi}' di '{lokasi}'. Pilih sub-lokasi lain atau periksa dataset Anda.")
     else:
-        # Training Model
-        X = df_filtered[['LT', 'LB', 'JKT', 'JKM', 'GRS']]
-        y = df_filtered['HARGA']
-
-        model = LinearRegression()
-        model.fit(X, y)
-
-        # Prediksi
-        input_data = np.array([[lt, lb, kamar_tidur, kamar_mandi, garasi]])
-        prediksi = model.predict(input_data)
-
-
-        # Fungsi untuk mengambil summary statistik berdasarkan lokasi
-        def summary_statistics(df, location):
-            lokasi_data = df[df['KOTA'] == location]
-            mean = lokasi_data['HARGA'].mean()
-            median = lokasi_data['HARGA'].median()
-            min_price = lokasi_data['HARGA'].min()
-            max_price = lokasi_data['HARGA'].max()
-            return mean, median, min_price, max_price
+        # Prediksi dengan koefisien regresi yang sudah dihitung saat data dimuat
+        with profiler.section('predict'):
+            prediksi = model.predict(lokasi, sub_lokasi, lt, lb, kamar_tidur, kamar_mandi, garasi)
+        st.success(f"Prediksi Harga Rumah: Rp {prediksi:,.2f}")
 
         # Menampilkan statistik harga berdasarkan lokasi yang dipilih
-        mean, median, min_price, max_price = summary_statistics(df, sub_lokasi)
+        with profiler.section('statistics'):
+            statistik = model.statistics(lokasi, sub_lokasi)
         st.subheader(f'Statistik Harga Rumah di {sub_lokasi}')
-        st.write(f"Rata-rata Harga: Rp {mean:,.2f}")
-        st.write(f"Median Harga: Rp {median:,.2f}")
-        st.write(f"Rentang Harga: Rp {min_price:,.2f} - Rp {mean:,.2f}")
+        st.write(f"Rata-rata Harga: Rp {statistik['mean']:,.2f}")
+        st.write(f"Median Harga: Rp {statistik['median']:,.2f}")
+        st.write(f"Rentang Harga: Rp {statistik['min']:,.2f} - Rp {statistik['max']:,.2f}")
+
+profiler.finish()
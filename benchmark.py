@@ -0,0 +1,270 @@
+# Benchmark latency/throughput untuk jalur prediksi (energi dan harga rumah).
+# Input sintetis dibangkitkan dari skema fitur setiap model, lalu setiap tahap
+# diukur langsung (load model, preprocessing, model.predict sklearn, engine pohon
+# terkompilasi, predict end-to-end)
+# dan lewat Flask test client. Hasil berupa JSON agar bisa dibandingkan antar run.
+# Cache prediksi dimatikan untuk semua case kecuali predict_cached, supaya run setelah
+# warmup tidak terukur sebagai cache hit. Memori dilaporkan per case: puncak RSS selama
+# case (peak_rss_mb) dan kenaikannya dari RSS di awal case (rss_delta_mb).
+#
+# Contoh:
+#   python benchmark.py --output bench.json
+#   python benchmark.py --models air_conditioners --batch-sizes 1 100 10000 --skip-flask
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Menambahkan direktori app ke sys.path agar package loader dapat diimpor
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+
+from loader.cache import prediction_cache
+from loader.registry import registry
+from loader.schema import get_schema
+from loader.tree_engine import get_engine
+from loader import house_price
+
+ENERGY_MODELS = ['air_conditioners', 'televisions', 'air_cleaner']
+ENERGY_ROUTES = {'air_conditioners': '/predict-ac', 'televisions': '/predict-tv'}
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000]
+
+
+# Puncak RSS proses. Di Linux dibaca dari VmHWM, yang bisa di-reset lewat
+# /proc/self/clear_refs (lihat reset_peak_rss); di platform lain ru_maxrss adalah
+# puncak seumur proses.
+def peak_rss_mb():
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# Fungsi untuk me-reset puncak RSS ke RSS saat ini (hanya Linux). Jika tidak bisa,
+# rss_delta_mb hanya menunjukkan kenaikan puncak seumur proses (batas bawah).
+def reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+    except OSError:
+        pass
+
+
+# Cache prediksi dimatikan selama blok berjalan
+@contextmanager
+def cache_disabled():
+    maxsize = prediction_cache.maxsize
+    prediction_cache.maxsize = 0
+    try:
+        yield
+    finally:
+        prediction_cache.maxsize = maxsize
+
+
+# Fungsi untuk membangkitkan record sintetis sesuai skema fitur model
+def synthetic_records(model_type, n_rows, rng):
+    schema = get_schema(model_type)
+    scaler = registry.get('scaler')
+    scaler_stats = dict(zip(scaler.feature_names_in_, zip(scaler.mean_, scaler.scale_)))
+
+    columns = {}
+    for col in schema.columns:
+        categories = schema.categories.get(col)
+        if categories is not None:
+            categories = [value for value in categories if not pd.isna(value)]
+            values = np.asarray(categories, dtype=object)[rng.integers(len(categories), size=n_rows)]
+            if col not in schema.categorical_columns:
+                values = values.astype(float)
+        elif col in scaler_stats:
+            mean, scale = scaler_stats[col]
+            values = np.abs(rng.normal(mean, scale, size=n_rows))
+        else:
+            values = rng.random(n_rows)
+        columns[col] = values.tolist()
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def synthetic_price_records(n_rows, rng):
+    regions = [region for region in house_price.get_model().regions if house_price.get_model().has_data(*region)]
+    picks = rng.integers(len(regions), size=n_rows)
+    return [{'lokasi': regions[i][0], 'sub_lokasi': regions[i][1],
+             'LT': int(rng.integers(50, 1000)), 'LB': int(rng.integers(50, 1000)),
+             'JKT': int(rng.integers(1, 10)), 'JKM': int(rng.integers(1, 10)),
+             'GRS': int(rng.integers(0, 2))} for i in picks]
+
+
+# Menjalankan `fn` berulang kali dan menghitung statistik latency
+def measure(case, model_type, batch_size, fn, repeat, min_time):
+    reset_peak_rss()
+    rss_before = peak_rss_mb()
+    fn()  # Warmup (juga memastikan model sudah dimuat)
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeat or (time.perf_counter() - started < min_time and len(timings) < 1000):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    peak = peak_rss_mb()
+
+    timings = np.array(timings)
+    result = {
+        "case": case,
+        "model": model_type,
+        "batch_size": batch_size,
+        "runs": len(timings),
+        "mean_ms": timings.mean() * 1e3,
+        "p50_ms": np.percentile(timings, 50) * 1e3,
+        "p95_ms": np.percentile(timings, 95) * 1e3,
+        "p99_ms": np.percentile(timings, 99) * 1e3,
+        "rows_per_sec": batch_size / timings.mean(),
+        "peak_rss_mb": peak,
+        "rss_delta_mb": None if peak is None else peak - rss_before,
+    }
+    print(f"{case:<22} {model_type:<18} batch={batch_size:<7} p50={result['p50_ms']:.3f}ms "
+          f"p99={result['p99_ms']:.3f}ms rows/s={result['rows_per_sec']:.0f}", file=sys.stderr)
+    return result
+
+
+def bench_energy(model_type, batch_sizes, client, args, rng):
+    from loader.predictor import predict, predict_uncached
+
+    results = []
+
+    # Biaya memuat model dari disk (registry dikosongkan setiap run)
+    def cold_load():
+        registry.invalidate(model_type)
+        registry.get(model_type)
+    results.append(measure('load_model', model_type, 1, cold_load, args.repeat, args.min_time))
+
+    model = registry.get(model_type)
+    schema = get_schema(model_type)
+    engine = get_engine(model_type)
+    for batch_size in batch_sizes:
+        records = synthetic_records(model_type, batch_size, rng)
+        frame = schema.frame(records)
+        cases = [
+            ('preprocess_input', lambda: schema.frame(records)),
+            ('model_predict', lambda: model.predict(frame)),
+        ]
+        if engine is not None:
+            encoded = engine.encode(schema.arrays(records))
+            cases += [
+                ('engine_encode', lambda: engine.encode(schema.arrays(records))),
+                ('engine_predict', lambda: engine.predict_encoded(encoded)),
+            ]
+        cases += [
+            ('predict_uncached', lambda: predict_uncached(model_type, records)),
+            ('predict_cached', lambda: predict(model_type, records)),
+        ]
+        if client is not None and model_type in ENERGY_ROUTES:
+            route = ENERGY_ROUTES[model_type]
+            if batch_size == 1:
+                cases.append(('flask_single', lambda: client.post(route, json=records[0])))
+            cases.append(('flask_batch', lambda: client.post(route + '/batch', json=records)))
+        for case, fn in cases:
+            if case == 'predict_cached':
+                results.append(measure(case, model_type, batch_size, fn, args.repeat, args.min_time))
+                continue
+            with cache_disabled():
+                results.append(measure(case, model_type, batch_size, fn, args.repeat, args.min_time))
+    return results
+
+
+def bench_house_price(batch_sizes, client, args, rng):
+    results = []
+    df = house_price.load_data()
+    model = house_price.get_model()
+
+    results.append(measure('load_data', 'house_price', len(df), house_price.load_data, args.repeat, args.min_time))
+    results.append(measure('build_model', 'house_price', len(df), lambda: house_price.HousePriceModel.from_frame(df),
+                           args.repeat, args.min_time))
+
+    # Cara lama di house-price.py: filter str.contains + fit LinearRegression setiap klik
+    from sklearn.linear_model import LinearRegression
+    def fit_per_click():
+        df_filtered = df[(df['KOTA'].str.contains('Jakarta Barat')) & (df['KOTA'].str.contains('Jakarta'))]
+        LinearRegression().fit(df_filtered[house_price.feature_columns], df_filtered['HARGA'])
+    results.append(measure('fit_per_click', 'house_price', 1, fit_per_click, args.repeat, args.min_time))
+
+    for batch_size in batch_sizes:
+        records = synthetic_price_records(batch_size, rng)
+        results.append(measure('predict_batch', 'house_price', batch_size,
+                               lambda: model.predict_batch(records), args.repeat, args.min_time))
+        if client is not None:
+            results.append(measure('flask_batch', 'house_price', batch_size,
+                                   lambda: client.post('/predict-price/batch', json=records),
+                                   args.repeat, args.min_time))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the prediction paths and report JSON.")
+    parser.add_argument('--models', nargs='+', default=ENERGY_MODELS + ['house_price'],
+                        choices=ENERGY_MODELS + ['house_price'], help="Models to benchmark (default: all)")
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=DEFAULT_BATCH_SIZES,
+                        help="Batch sizes (default: 1 10 100 1000 10000 100000)")
+    parser.add_argument('--repeat', type=int, default=5, help="Minimum runs per case (default: 5)")
+    parser.add_argument('--min-time', type=float, default=0.5, help="Minimum seconds per case (default: 0.5)")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for synthetic inputs (default: 42)")
+    parser.add_argument('--skip-flask', action='store_true', help="Do not benchmark through the Flask test client")
+    parser.add_argument('--output', help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    client = None
+    if not args.skip_flask:
+        from app import app
+        app.config['MAX_BATCH_SIZE'] = max(app.config['MAX_BATCH_SIZE'], max(args.batch_sizes))
+        client = app.test_client()
+
+    results = []
+    for model_type in args.models:
+        if model_type == 'house_price':
+            results.extend(bench_house_price(args.batch_sizes, client, args, rng))
+        else:
+            results.extend(bench_energy(model_type, args.batch_sizes, client, args, rng))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sklearn": sklearn.__version__,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+# Scoring massal katalog appliance dari file CSV/Parquet dengan model yang sama
+# seperti API Flask. Input dibaca per chunk sehingga memori tetap terbatas
+# berapapun ukuran file-nya, dan hasil langsung ditulis ke file output.
+#
+# Contoh:
+#   python score.py air_conditioners katalog-ac.csv hasil-ac.csv
+#   python score.py televisions katalog-tv.parquet hasil-tv.parquet --chunksize 50000 --workers 4
+
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Menambahkan direktori app ke sys.path agar package loader dapat diimpor
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+
+from loader.load_air_cleaner import preprocess_input as preprocess_air_cleaner_input
+from loader.registry import registry
+from loader.schema import get_schema
+from loader.tree_engine import get_engine
+
+# Model yang bisa dipakai untuk scoring (model dengan skema fitur)
+SCORABLE_MODELS = ['air_conditioners', 'televisions', 'air_cleaner']
+
+# Preprocessing khusus sebelum skema fitur diterapkan, sama seperti di API
+# (air cleaner: kolom kategorikal asli diubah menjadi kolom dummy)
+PREPROCESSORS = {
+    'air_cleaner': preprocess_air_cleaner_input,
+}
+
+
+# Fungsi untuk memprediksi satu chunk; dijalankan di proses utama atau di worker
+def score_chunk(model_type, chunk):
+    preprocess = PREPROCESSORS.get(model_type)
+    if preprocess is not None:
+        chunk = preprocess(chunk)
+    engine = get_engine(model_type)
+    if engine is not None:
+        return engine.predict(chunk)
+    input_data_processed = get_schema(model_type).frame(chunk)
+    return registry.get(model_type).predict(input_data_processed)
+
+
+def is_parquet(path):
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("Parquet support requires pyarrow (pip install pyarrow).")
+    return pyarrow
+
+
+# Membaca file input per chunk (CSV via read_csv chunksize, Parquet per batch row group)
+def read_chunks(path, chunksize):
+    if is_parquet(path):
+        pyarrow = import_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    # Menulis hasil per chunk ke CSV (append) atau Parquet (satu row group per chunk)
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._parquet_writer = None
+
+    def write(self, chunk):
+        if is_parquet(self.path):
+            pyarrow = import_pyarrow()
+            table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def with_predictions(chunk, y_pred, output_column, only_prediction):
+    if only_prediction:
+        return pd.DataFrame({output_column: y_pred})
+    return chunk.assign(**{output_column: y_pred})
+
+
+def score_file(model_type, input_path, output_path, chunksize=10000, workers=1,
+               output_column='predicted_energy_consumption', only_prediction=False):
+    writer = ChunkWriter(output_path)
+    try:
+        if workers <= 1:
+            for chunk in read_chunks(input_path, chunksize):
+                y_pred = score_chunk(model_type, chunk)
+                writer.write(with_predictions(chunk, y_pred, output_column, only_prediction))
+            return writer.rows
+
+        # Chunk dibagi ke beberapa proses; jumlah chunk yang sedang diproses dibatasi
+        # agar memori tetap terbatas, dan hasil ditulis sesuai urutan input
+        max_pending = 2 * workers
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in read_chunks(input_path, chunksize):
+                pending.append((chunk, executor.submit(score_chunk, model_type, chunk)))
+                if len(pending) >= max_pending:
+                    done_chunk, future = pending.popleft()
+                    writer.write(with_predictions(done_chunk, future.result(), output_column, only_prediction))
+            while pending:
+                done_chunk, future = pending.popleft()
+                writer.write(with_predictions(done_chunk, future.result(), output_column, only_prediction))
+        return writer.rows
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score an appliance catalogue (CSV or Parquet) in chunks.")
+    parser.add_argument('model', choices=SCORABLE_MODELS, help="Model type to score with")
+    parser.add_argument('input', help="Input .csv or .parquet file")
+    parser.add_argument('output', help="Output .csv or .parquet file")
+    parser.add_argument('--chunksize', type=int, default=10000, help="Rows per chunk (default: 10000)")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes (default: 1, no pool)")
+    parser.add_argument('--output-column', default='predicted_energy_consumption',
+                        help="Name of the prediction column (default: predicted_energy_consumption)")
+    parser.add_argument('--only-prediction', action='store_true',
+                        help="Write only the prediction column instead of the input columns plus prediction")
+    args = parser.parse_args(argv)
+
+    if args.chunksize <= 0 or args.workers <= 0:
+        parser.error("--chunksize and --workers must be positive")
+
+    rows = score_file(args.model, args.input, args.output, chunksize=args.chunksize, workers=args.workers,
+                      output_column=args.output_column, only_prediction=args.only_prediction)
+    print(f"Scored {rows} rows with {args.model} -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
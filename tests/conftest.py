@@ -0,0 +1,46 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Menambahkan direktori app ke sys.path agar package loader dapat diimpor
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+
+# Record acak dari kategori yang dikenal model (ditambah nilai kosong dan kategori
+# yang tidak dikenal) dan angka acak untuk kolom numerik
+def _random_records(schema, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(n_rows):
+        record = {}
+        for col in schema.columns:
+            if col in schema.categorical_columns:
+                known = [value for value in schema.categories[col] if isinstance(value, str)]
+                choice = rng.integers(len(known) + 2)
+                record[col] = known[choice] if choice < len(known) else (None if choice == len(known) else 'unknown')
+            else:
+                record[col] = None if rng.random() < 0.1 else float(rng.uniform(0, 100))
+        records.append(record)
+    return records
+
+
+# Factory record acak: random_records(schema, n_rows, seed=0)
+@pytest.fixture
+def random_records():
+    return _random_records
+
+
+# Registry dan cache prediksi dikosongkan sebelum dan sesudah test, supaya skema,
+# engine, atau hasil yang dibangun dengan rata-rata training palsu tidak terbawa
+@pytest.fixture
+def fresh_registry():
+    from loader.cache import prediction_cache
+    from loader.registry import registry
+
+    registry.invalidate()
+    prediction_cache.clear()
+    yield registry
+    registry.invalidate()
+    prediction_cache.clear()
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from loader.batcher import MicroBatcher
+
+
+# predict_fn palsu: hasil 2 * x per record, ValueError jika ada record yang rusak.
+# Setiap pemanggilan dicatat (jumlah record per batch).
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, model_type, records, arrays=None):
+        with self.lock:
+            self.calls.append(len(records))
+        if any(record['x'] == 'bad' for record in records):
+            raise ValueError("bad record")
+        return np.array([2.0 * record['x'] for record in records])
+
+
+@pytest.fixture
+def model():
+    return FakeModel()
+
+
+def test_results_go_to_the_right_callers(model):
+    batcher = MicroBatcher(model, max_batch_size=16, max_wait=0.05)
+    barrier = threading.Barrier(32)
+
+    def request(i):
+        records = [{'x': i + k / 10} for k in range(i % 3 + 1)]
+        barrier.wait()
+        return records, batcher.predict('m', records)
+
+    with ThreadPoolExecutor(32) as pool:
+        for records, result in pool.map(request, range(32)):
+            np.testing.assert_array_equal(result, [2.0 * record['x'] for record in records])
+    # Request digabung: lebih sedikit pemanggilan model daripada request
+    assert len(model.calls) < 32
+    assert max(model.calls) <= 16
+
+
+def test_bad_record_fails_only_its_own_request(model):
+    batcher = MicroBatcher(model, max_batch_size=16, max_wait=0.2)
+    futures = [batcher.submit('m', [{'x': 1}]), batcher.submit('m', [{'x': 'bad'}, {'x': 2}]),
+               batcher.submit('m', [{'x': 3}])]
+
+    np.testing.assert_array_equal(futures[0].result(timeout=5), [2.0])
+    with pytest.raises(ValueError):
+        futures[1].result(timeout=5)
+    np.testing.assert_array_equal(futures[2].result(timeout=5), [6.0])
+    assert model.calls[0] == 4
+
+
+def test_full_batch_is_flushed_without_waiting(model):
+    batcher = MicroBatcher(model, max_batch_size=4, max_wait=30)
+    started = time.monotonic()
+    futures = [batcher.submit('m', [{'x': i}]) for i in range(4)]
+
+    assert [float(future.result(timeout=5)[0]) for future in futures] == [0.0, 2.0, 4.0, 6.0]
+    assert time.monotonic() - started < 5
+    assert model.calls == [4]
+
+
+def test_partial_batch_is_flushed_after_max_wait(model):
+    batcher = MicroBatcher(model, max_batch_size=64, max_wait=0.05)
+    started = time.monotonic()
+    future = batcher.submit('m', [{'x': 1}])
+
+    np.testing.assert_array_equal(future.result(timeout=5), [2.0])
+    assert time.monotonic() - started >= 0.05
+    assert model.calls == [1]
+
+
+def test_predict_async(model):
+    batcher = MicroBatcher(model, max_batch_size=8, max_wait=0.2)
+
+    async def run():
+        small = [batcher.predict_async('m', {'x': i}) for i in range(5)]
+        full = batcher.predict_async('m', [{'x': i} for i in range(8)])
+        return await asyncio.gather(*small, full)
+
+    *small, full = asyncio.run(run())
+    assert [float(result[0]) for result in small] == [0.0, 2.0, 4.0, 6.0, 8.0]
+    np.testing.assert_array_equal(full, np.arange(8) * 2.0)
+    # Request yang sudah sebesar satu batch penuh diprediksi langsung, tanpa antri
+    assert sorted(model.calls) == [5, 8]
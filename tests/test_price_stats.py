@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from loader import house_price
+from loader.house_price import HousePriceModel, feature_columns, price_regions
+from loader.price_stats import PriceStats
+
+with open(house_price.csv_file_path, 'rb') as _file:
+    HEADER, *LINES = _file.read().splitlines(keepends=True)
+
+
+# Menulis CSV listing dari header dan baris-baris contoh
+def write_csv(path, lines):
+    path.write_bytes(HEADER + b''.join(lines))
+    return str(path)
+
+
+# Model yang dibangun dari awal dari isi CSV yang sama (direktori lain, tanpa state)
+def rebuilt(path, tmp_path):
+    directory = tmp_path / 'rebuilt'
+    directory.mkdir(exist_ok=True)
+    copy = directory / 'listings.csv'
+    copy.write_bytes(open(path, 'rb').read())
+    return HousePriceModel.from_csv(str(copy))
+
+
+def assert_same_model(model, expected):
+    np.testing.assert_array_equal(model.row_counts, expected.row_counts)
+    np.testing.assert_allclose(model.coef, expected.coef, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(model.intercept, expected.intercept, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(model.stats, expected.stats, rtol=1e-12, equal_nan=True)
+
+
+def saved_source(path):
+    return PriceStats.load(house_price.state_path(path), price_regions(), feature_columns).source
+
+
+def test_append_matches_rebuild(tmp_path):
+    path = write_csv(tmp_path / 'listings.csv', LINES[:400])
+    HousePriceModel.from_csv(path)
+    with open(path, 'ab') as file:
+        file.write(b''.join(LINES[400:]))
+
+    model = HousePriceModel.from_csv(path)
+    assert_same_model(model, rebuilt(path, tmp_path))
+    assert saved_source(path)["offset"] == os.path.getsize(path)
+
+
+def test_partial_last_line_is_deferred(tmp_path):
+    partial = LINES[300][:10]
+    path = write_csv(tmp_path / 'listings.csv', LINES[:300] + [partial])
+    model = HousePriceModel.from_csv(path)
+    complete = write_csv(tmp_path / 'complete.csv', LINES[:300])
+    assert_same_model(model, rebuilt(complete, tmp_path))
+    assert saved_source(path)["offset"] == len(HEADER) + len(b''.join(LINES[:300]))
+
+    with open(path, 'ab') as file:
+        file.write(LINES[300][10:] + b''.join(LINES[301:400]))
+    model = HousePriceModel.from_csv(path)
+    assert_same_model(model, rebuilt(path, tmp_path))
+
+
+@pytest.mark.parametrize('line', [0, 150, 299])
+def test_edit_in_processed_prefix_triggers_rebuild(tmp_path, line):
+    lines = LINES[:300]
+    path = write_csv(tmp_path / 'listings.csv', lines)
+    HousePriceModel.from_csv(path)
+
+    # Harga diubah tanpa mengubah panjang file, lalu satu baris ditambahkan
+    edited = list(lines)
+    price, rest = edited[line].split(b',', 1)
+    edited[line] = price[:-1] + (b'1' if price[-1:] != b'1' else b'2') + b',' + rest
+    path = write_csv(tmp_path / 'listings.csv', edited + LINES[300:301])
+
+    stats = PriceStats.load(house_price.state_path(path), price_regions(), feature_columns)
+    assert stats.fold_csv(path, house_price.parse_listings) is None
+    assert_same_model(HousePriceModel.from_csv(path), rebuilt(path, tmp_path))
+
+
+def test_shrunk_file_triggers_rebuild(tmp_path):
+    path = write_csv(tmp_path / 'listings.csv', LINES[:400])
+    HousePriceModel.from_csv(path)
+    path = write_csv(tmp_path / 'listings.csv', LINES[:200])
+
+    stats = PriceStats.load(house_price.state_path(path), price_regions(), feature_columns)
+    assert stats.fold_csv(path, house_price.parse_listings) is None
+    assert_same_model(HousePriceModel.from_csv(path), rebuilt(path, tmp_path))
+
+
+def test_closed_form_matches_linear_regression():
+    df = house_price.load_data()
+    model = HousePriceModel.from_frame(df)
+    kota = df['KOTA'].astype(str)
+
+    checked = 0
+    for i, (lokasi, sub_lokasi) in enumerate(model.regions):
+        rows = df[kota.str.contains(lokasi, regex=False) & kota.str.contains(sub_lokasi, regex=False)]
+        if len(rows) <= len(feature_columns) + 1:
+            continue
+        expected = LinearRegression().fit(rows[feature_columns].to_numpy(dtype=float), rows['HARGA'])
+        np.testing.assert_allclose(model.coef[i], expected.coef_, rtol=1e-6, atol=1e-6 * np.abs(expected.coef_).max())
+        np.testing.assert_allclose(model.intercept[i], expected.intercept_, rtol=1e-6)
+        checked += 1
+    assert checked
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from loader.batch import predict_batch
+from loader.household import predict_household
+from loader.load_air_cleaner import predict_air_cleaner_energy_consumption
+from loader.load_ac import predict_energy_consumption
+from loader.load_refrigerator import predict_refrigerator_energy_consumption
+from loader.load_tv import predict_tv_energy_consumption
+from loader.schema import ValidationError, get_schema
+
+SCREEN_SIZE = 'Diagonal Viewable Screen Size (in.)'
+
+
+@pytest.fixture
+def ac_record(random_records):
+    return random_records(get_schema('air_conditioners'), 1, seed=3)[0]
+
+
+@pytest.fixture
+def tv_record(random_records):
+    return random_records(get_schema('televisions'), 1, seed=2)[0] | {SCREEN_SIZE: 42.0}
+
+
+@pytest.fixture
+def client():
+    from app import app
+    return app.test_client()
+
+
+@pytest.mark.parametrize('column, value', [
+    ('height_inches', 'tall'),
+    ('height_inches', float('inf')),
+    ('height_inches', [1, 2]),
+    ('heating_mode', {'x': 1}),
+    ('heating_mode', 5),
+])
+def test_ac_rejects_invalid_values(ac_record, column, value):
+    with pytest.raises(ValidationError) as info:
+        predict_energy_consumption([{**ac_record, column: value}])
+    assert column in info.value.errors[0]
+
+
+@pytest.mark.parametrize('column, value', [
+    (SCREEN_SIZE, 'abc'),
+    (SCREEN_SIZE, float('inf')),
+    (SCREEN_SIZE, [1, 2]),
+    ('Brand Name', {'x': 1}),
+    ('Brand Name', 5),
+])
+def test_tv_rejects_invalid_values(tv_record, column, value):
+    with pytest.raises(ValidationError) as info:
+        predict_tv_energy_consumption([{**tv_record, column: value}])
+    assert column in info.value.errors[0]
+
+
+def test_errors_list_every_invalid_column(ac_record):
+    with pytest.raises(ValidationError) as info:
+        predict_energy_consumption([{**ac_record, 'height_inches': 'tall', 'heating_mode': ['Yes']}])
+    assert info.value.errors == ["Invalid values for: height_inches (expected a number), "
+                                 "heating_mode (expected a string)."]
+
+
+def test_missing_and_numeric_string_values_are_valid(ac_record):
+    record = {**ac_record, 'height_inches': 20.0}
+    expected = predict_energy_consumption(record)
+    np.testing.assert_array_equal(predict_energy_consumption({**record, 'height_inches': '20'}), expected)
+    assert np.isfinite(predict_energy_consumption({**record, 'height_inches': None, 'heating_mode': None})).all()
+
+
+def test_batch_rejects_only_invalid_rows(ac_record):
+    records = [ac_record, {**ac_record, 'heating_mode': {'x': 1}}, ac_record, {**ac_record, 'height_inches': 'abc'}]
+    results = predict_batch(predict_energy_consumption, records)
+
+    expected = float(predict_energy_consumption(ac_record)[0])
+    assert results[0] == results[2] == {"predicted_energy_consumption": expected}
+    assert results[1] == {"error": "Invalid values for: heating_mode (expected a string)."}
+    assert results[3] == {"error": "Invalid values for: height_inches (expected a number)."}
+
+
+def test_household_rejects_invalid_devices(ac_record, tv_record):
+    results, total = predict_household([{**tv_record, 'appliance': 'tv', SCREEN_SIZE: 'abc'},
+                                        {**ac_record, 'appliance': 'ac'}])
+    assert "error" in results[0]
+    assert total == results[1]["predicted_energy_consumption"]
+
+
+def test_routes_return_400_for_invalid_input(client, ac_record):
+    response = client.post('/predict-ac', json={**ac_record, 'heating_mode': {'x': 1}})
+    assert response.status_code == 400
+
+    response = client.post('/predict-ac/batch', json=[ac_record, {**ac_record, 'height_inches': 'abc'}])
+    body = response.get_json()
+    assert body["errors"] == 1
+    assert "predicted_energy_consumption" in body["results"][0]
+
+
+def test_tv_routes_return_400_for_invalid_input(client, tv_record):
+    response = client.post('/predict-tv', json={**tv_record, 'Brand Name': {'x': 1}})
+    assert response.status_code == 400
+
+    response = client.post('/predict-tv/batch', json=[tv_record, {**tv_record, SCREEN_SIZE: 'abc'}])
+    body = response.get_json()
+    assert body["errors"] == 1
+    assert "predicted_energy_consumption" in body["results"][0]
+
+
+@pytest.mark.parametrize('payload', ['x', 5, [], [{}, 1]])
+def test_ac_route_rejects_non_object_payloads(client, payload):
+    response = client.post('/predict-ac', json=payload)
+    assert response.status_code == 400
+    assert "Expected JSON object" in response.get_json()["error"]
+
+
+def test_ac_route_rejects_malformed_json(client):
+    response = client.post('/predict-ac', data='{bad', content_type='application/json')
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('predict_fn', [predict_energy_consumption, predict_tv_energy_consumption,
+                                        predict_air_cleaner_energy_consumption,
+                                        predict_refrigerator_energy_consumption])
+def test_non_object_records_are_rejected_per_row(predict_fn):
+    with pytest.raises(ValidationError) as info:
+        predict_fn([{}, 'x', 1, None])
+    assert info.value.errors[0] is None
+    assert info.value.errors[1:] == ["Invalid input data format. Expected JSON object."] * 3
+
+
+def test_batch_routes_reject_non_object_records(client, ac_record):
+    body = client.post('/predict-ac/batch', json=[ac_record, 'x', 1, None]).get_json()
+    assert body["errors"] == 3
+    assert "predicted_energy_consumption" in body["results"][0]
+
+    results, _ = predict_household(['x', {**ac_record, 'appliance': 'ac'}])
+    assert "error" in results[0] and "predicted_energy_consumption" in results[1]
+
+
+def test_refrigerator_target_is_not_an_input():
+    expected = predict_refrigerator_energy_consumption([{}])
+    for value in (1e6, 'abc'):
+        record = {'annual_energy_use_kwh_yr': value}
+        np.testing.assert_array_equal(predict_refrigerator_energy_consumption([record]), expected)
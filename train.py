@@ -0,0 +1,346 @@
+# Pipeline training model energi (pengganti langkah training di notebook
+# ML-preparation/models-notebook/house-energy). Beberapa kandidat model dievaluasi
+# dengan K-fold cross validation, dan semua pasangan (kandidat, fold) dijalankan
+# paralel di beberapa proses. Preprocessing (OneHotEncoder/ColumnTransformer dan filter
+# outlier IsolationForest) dijalankan sekali per fold lalu hasilnya dipakai bersama oleh
+# semua kandidat, bukan dihitung ulang untuk setiap kandidat.
+#
+# Kandidat terbaik (MSE cross validation terkecil) disimpan sebagai artefak berversi:
+#   app/models-pickle/house-energy/versions/<model>/<versi>/model.pkl + metrics.json
+# Dengan --publish, artefak juga disalin ke path .pkl yang dibaca registry (beserta
+# <nama>.metrics.json), sehingga API dan serve.py memuat model baru secara otomatis.
+# Sebelum dipublikasikan, model terpilih harus lolos sanity check (lihat sanity_check);
+# jika gagal, artefak berversi tetap disimpan tetapi tidak dipublikasikan.
+#
+# Contoh:
+#   python train.py televisions --publish
+#   python train.py air_conditioners --data ac.csv --folds 5 --jobs 8
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingRegressor, IsolationForest, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import KFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+from sklearn.tree import DecisionTreeRegressor
+
+# Menambahkan direktori app ke sys.path agar package loader dapat diimpor
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
+
+from loader.model_store import file_digest, metrics_path
+from loader.registry import model_paths, models_dir
+
+# Resep data per model, sama dengan notebook:
+# - source: URL/path dataset default
+# - drop: kolom yang tidak relevan untuk prediksi kWh/tahun
+# - encode: 'categorical' (ColumnTransformer one-hot kolom object, kolom lain dibuang)
+#           atau 'all' (OneHotEncoder untuk semua kolom)
+# - outlier_filter: buang outlier data training dengan IsolationForest
+TrainingSpec = namedtuple('TrainingSpec', ['source', 'drop', 'rename', 'target', 'drop_empty', 'encode',
+                                           'outlier_filter'])
+
+TRAINING_SPECS = {
+    'air_conditioners': TrainingSpec(
+        source='https://data.energystar.gov/resource/5xn2-dv4h.csv',
+        drop=[
+            'pd_id', 'brand_name', 'model_number', 'additional_model_information',
+            'upc', 'support_bracket', 'product_class', 'connected_capable', 'connects_using',
+            'communication_hardware_architecture', 'dr_protocol',
+            'primary_communication_module_device_brand_name_and_model_number', 'network_security_standards',
+            'network_standby_power_w', 'broadband_connection_needed_for_demand_response',
+            'direct_on_premises_open_standard_based_interconnection', 'date_available_on_market', 'date_certified',
+            'markets', 'energy_star_model_identifier', 'meets_most_efficient_criteria',
+            'percent_less_energy_use_than_us_federal_standard', 'refrigerant_type',
+            'refrigerant_with_gwp', 'combined_energy_efficiency_ratio_ceer', 'variable_speed_compressor',
+        ],
+        rename={},
+        target='annual_energy_use_kwh_yr',
+        drop_empty=True,
+        encode='categorical',
+        outlier_filter=True,
+    ),
+    'televisions': TrainingSpec(
+        source='https://raw.githubusercontent.com/josgiv/home-appliance-dataset/master/Televisions.csv',
+        drop=[
+            'ENERGY STAR Unique ID', 'ENERGY STAR Partner', 'UPC',
+            'Native Horizontal Resolution (pixels)', 'Native Vertical Resolution (pixels)',
+            'Date Available On Market', 'Date Certified', 'Model Name', 'Model Number',
+            'Additional Model Information', 'Product Type', 'CB Model Identifier', 'Markets', 'Application',
+            'Screen Area (sq. in.)',
+            'Reported On Mode Power (per the Federal Test Procedure) (watts)',
+            'Power Consumption in Standby Mode when Not Connected to a Network (watts)',
+            'Power Consumption in Standby Mode when Connected to a Network (watts)',
+            'Reported Standby-Active, Low Mode Power (watts)',
+            'Measured Standby Mode Power (Watts)',
+            'Average On Mode Power Consumption for Certification (watts)',
+            'Maximum Average On Mode Power for Certification (watts)',
+            'Features',
+        ],
+        rename={
+            'Is Automatic Brightness Control Enabled by Default in the Default SDR Preset Picture Setting '
+            'When Television is Shipped?': 'Auto Brightness',
+        },
+        target='Reported Annual Energy Consumption (kWh)',
+        drop_empty=False,
+        encode='all',
+        outlier_filter=False,
+    ),
+}
+
+# Kandidat model yang dibandingkan (n_jobs=1: paralelisme ada di level kandidat/fold).
+# Model linear memakai Ridge: one-hot lengkap (tanpa drop) membuat matriks desain tidak
+# full rank, dan LinearRegression biasa menghasilkan koefisien ~1e16 yang meledak untuk
+# kombinasi kategori yang tidak ada di data training.
+CANDIDATES = {
+    'ridge': Ridge(alpha=1.0),
+    'decision_tree': DecisionTreeRegressor(random_state=42),
+    'random_forest': RandomForestRegressor(random_state=42, n_jobs=1),
+    'gradient_boosting': GradientBoostingRegressor(random_state=42),
+}
+
+# Sanity check sebelum publish: prediksi harus finite dan berada di dalam rentang target
+# training yang diperlebar SANITY_MARGIN x lebar rentang tersebut di kedua sisi
+SANITY_MARGIN = 1.0
+UNKNOWN_CATEGORY = '__unknown__'
+
+# Fold hasil preprocessing untuk proses worker (diisi oleh _init_worker)
+_folds = None
+
+
+# Membaca dataset dan memisahkan fitur (X) dan label (y)
+def load_dataset(spec, path=None):
+    df = pd.read_csv(path or spec.source)
+    df = df.drop(columns=spec.drop, errors='ignore').rename(columns=spec.rename)
+    if spec.drop_empty:
+        # Menghapus kolom yang seluruh isinya adalah NaN
+        df = df.dropna(axis=1, how='all')
+    df = df.dropna(subset=[spec.target])
+    return df.drop(columns=[spec.target]), df[spec.target]
+
+
+def make_preprocessor(spec, X):
+    onehot = OneHotEncoder(handle_unknown='ignore')
+    if spec.encode == 'all':
+        return onehot
+    categorical_cols = X.select_dtypes(include=['object']).columns.tolist()
+    return ColumnTransformer(transformers=[('cat', Pipeline(steps=[('onehot', onehot)]), categorical_cols)])
+
+
+# Baris training yang bukan outlier menurut IsolationForest pada kolom numerik dan target
+# (kolom one-hot terlalu seragam untuk IsolationForest). Jika semua baris dianggap
+# outlier, filter tidak dipakai.
+def inlier_mask(X, y):
+    numeric = X.select_dtypes(include=['number']).assign(_target=np.asarray(y, dtype=float))
+    numeric = numeric.fillna(numeric.median()).fillna(0)
+    inliers = IsolationForest(random_state=42).fit_predict(numeric) == 1
+    return inliers if inliers.any() else np.ones(len(X), dtype=bool)
+
+
+# Fungsi untuk preprocessing satu fold: (opsional) outlier data training dibuang, lalu
+# preprocessor di-fit pada data training fold dan dipakai untuk data validasi
+def prepare_fold(spec, X_train, y_train, X_val, y_val, outlier_filter):
+    if outlier_filter:
+        inliers = inlier_mask(X_train, y_train)
+        X_train, y_train = X_train[inliers], y_train[inliers]
+    preprocessor = make_preprocessor(spec, X_train)
+    Xt_train = preprocessor.fit_transform(X_train)
+    Xt_val = preprocessor.transform(X_val)
+    return preprocessor, (Xt_train, np.asarray(y_train, dtype=float), Xt_val, np.asarray(y_val, dtype=float))
+
+
+def _init_worker(folds):
+    global _folds
+    _folds = folds
+
+
+# Melatih satu kandidat pada satu fold; model yang sudah di-fit ikut dikembalikan jika diminta
+def fit_fold(name, fold, return_model=False):
+    Xt_train, y_train, Xt_val, y_val = _folds[fold]
+    started = time.perf_counter()
+    model = clone(CANDIDATES[name]).fit(Xt_train, y_train)
+    y_pred = model.predict(Xt_val)
+    scores = {"mse": float(mean_squared_error(y_val, y_pred)), "r2": float(r2_score(y_val, y_pred)),
+              "fit_seconds": time.perf_counter() - started}
+    return scores, (model if return_model else None)
+
+
+# Fungsi untuk evaluasi semua kandidat. Fold terakhir adalah split holdout (train/test
+# seperti notebook); model kandidat dari split itu yang disimpan jika terpilih.
+def evaluate(spec, X, y, candidates, n_folds=5, jobs=1, outlier_filter=False, test_size=0.1):
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=42)
+    folds = []
+    for train_index, val_index in KFold(n_splits=n_folds, shuffle=True, random_state=42).split(X_train):
+        folds.append(prepare_fold(spec, X_train.iloc[train_index], y_train.iloc[train_index],
+                                  X_train.iloc[val_index], y_train.iloc[val_index], outlier_filter)[1])
+    preprocessor, holdout = prepare_fold(spec, X_train, y_train, X_test, y_test, outlier_filter)
+    folds.append(holdout)
+    holdout_fold = len(folds) - 1
+
+    tasks = [(name, fold) for name in candidates for fold in range(len(folds))]
+    if jobs <= 1:
+        _init_worker(folds)
+        outputs = [fit_fold(name, fold, fold == holdout_fold) for name, fold in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(folds,)) as executor:
+            futures = [executor.submit(fit_fold, name, fold, fold == holdout_fold) for name, fold in tasks]
+            outputs = [future.result() for future in futures]
+
+    results, models = {}, {}
+    for (name, fold), (scores, model) in zip(tasks, outputs):
+        result = results.setdefault(name, {"cv": [], "fit_seconds": 0.0})
+        result["fit_seconds"] += scores["fit_seconds"]
+        if fold == holdout_fold:
+            result["holdout"] = {"mse": scores["mse"], "r2": scores["r2"]}
+            models[name] = model
+        else:
+            result["cv"].append({"mse": scores["mse"], "r2": scores["r2"]})
+    for result in results.values():
+        cv_mse = [scores["mse"] for scores in result["cv"]]
+        cv_r2 = [scores["r2"] for scores in result["cv"]]
+        result.update(cv_mse=float(np.mean(cv_mse)), cv_mse_std=float(np.std(cv_mse)),
+                      cv_r2=float(np.mean(cv_r2)), cv_r2_std=float(np.std(cv_r2)))
+    return preprocessor, models, results, (X_test, y_test)
+
+
+# Fungsi untuk menguji pipeline terpilih sebelum dipublikasikan. Prediksi diperiksa untuk
+# data holdout, data holdout dengan semua kolom kategorikal diganti kategori yang tidak
+# dikenal, dan satu baris yang semua fiturnya kosong. Mengembalikan daftar masalah
+# (kosong jika lolos).
+def sanity_check(pipeline, X_test, y, margin=SANITY_MARGIN):
+    y = np.asarray(y, dtype=float)
+    span = max(float(y.max() - y.min()), abs(float(y.max())), 1.0)
+    low, high = float(y.min()) - margin * span, float(y.max()) + margin * span
+
+    categorical_cols = X_test.select_dtypes(include=['object']).columns
+    probes = {
+        "holdout": X_test,
+        "unknown categories": X_test.assign(**{col: UNKNOWN_CATEGORY for col in categorical_cols}),
+        "all features missing": pd.DataFrame(np.nan, index=[0], columns=X_test.columns)
+                                  .astype({col: object for col in categorical_cols}),
+    }
+    problems = []
+    for name, X_probe in probes.items():
+        y_pred = np.asarray(pipeline.predict(X_probe), dtype=float)
+        if not np.isfinite(y_pred).all():
+            problems.append(f"{name}: non-finite predictions")
+        elif y_pred.min() < low or y_pred.max() > high:
+            problems.append(f"{name}: predictions in [{y_pred.min():.4g}, {y_pred.max():.4g}] "
+                            f"outside [{low:.4g}, {high:.4g}]")
+    return problems
+
+
+def write_json(path, data):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(data, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+# Menyimpan pipeline terpilih sebagai artefak berversi; dengan `publish`, artefak juga
+# menggantikan file .pkl yang dibaca registry (ditulis ke file sementara lalu di-rename)
+def save_artifact(model_type, pipeline, metrics, publish=False):
+    versions_dir = os.path.join(models_dir, 'versions', model_type)
+    os.makedirs(versions_dir, exist_ok=True)
+    tmp_path = os.path.join(versions_dir, f'model.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as file:
+        pickle.dump(pipeline, file)
+    digest = file_digest(tmp_path)
+    version = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{digest[:12]}"
+    version_dir = os.path.join(versions_dir, version)
+    os.makedirs(version_dir)
+    artifact = os.path.join(version_dir, 'model.pkl')
+    os.replace(tmp_path, artifact)
+
+    metrics = {"model_type": model_type, "version": version, "sha256": digest, "artifact": artifact, **metrics}
+    write_json(os.path.join(version_dir, 'metrics.json'), metrics)
+    if publish:
+        # Metrik ditulis lebih dulu: saat registry memuat model baru, rata-rata training
+        # untuk skema fiturnya sudah tersedia
+        path = model_paths[model_type]
+        write_json(metrics_path(path), metrics)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(artifact, 'rb') as source, open(tmp_path, 'wb') as target:
+            target.write(source.read())
+        os.replace(tmp_path, path)
+    return artifact, metrics
+
+
+def train(model_type, data=None, candidates=None, n_folds=5, jobs=1, outlier_filter=None, publish=False):
+    spec = TRAINING_SPECS[model_type]
+    outlier_filter = spec.outlier_filter if outlier_filter is None else outlier_filter
+    started = time.perf_counter()
+    X, y = load_dataset(spec, data)
+    preprocessor, models, results, (X_test, _) = evaluate(spec, X, y, candidates or list(CANDIDATES),
+                                                          n_folds=n_folds, jobs=jobs,
+                                                          outlier_filter=outlier_filter)
+    selected = min(results, key=lambda name: results[name]["cv_mse"])
+    pipeline = Pipeline(steps=[('preprocessor', preprocessor), ('regressor', models[selected])])
+    problems = sanity_check(pipeline, X_test, y)
+
+    metrics = {
+        "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        "selected": selected,
+        "data": {"source": data or spec.source, "rows": len(X), "features": list(X.columns)},
+        # Rata-rata training kolom numerik, dipakai API untuk mengisi nilai yang kosong
+        "feature_means": X.select_dtypes(include=['number']).mean().dropna().to_dict(),
+        "folds": n_folds,
+        "outlier_filter": outlier_filter,
+        "jobs": jobs,
+        "sklearn_version": sklearn.__version__,
+        "train_seconds": time.perf_counter() - started,
+        "candidates": results,
+        "sanity_check": {"passed": not problems, "problems": problems},
+    }
+    artifact, metrics = save_artifact(model_type, pipeline, metrics, publish=publish and not problems)
+    if publish and problems:
+        raise ValueError(f"{selected} failed the sanity check and was not published "
+                         f"(artifact kept at {artifact}): {'; '.join(problems)}")
+    return artifact, metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train, compare and version the appliance energy models.")
+    parser.add_argument('model', choices=list(TRAINING_SPECS), help="Model type to train")
+    parser.add_argument('--data', help="Dataset CSV path or URL (default: the notebook's source)")
+    parser.add_argument('--candidates', nargs='+', choices=list(CANDIDATES),
+                        help="Candidate models to compare (default: all)")
+    parser.add_argument('--folds', type=int, default=5, help="Cross validation folds (default: 5)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for candidate/fold fits (default: number of CPUs)")
+    parser.add_argument('--outlier-filter', action=argparse.BooleanOptionalAction, default=None,
+                        help="Drop training outliers with IsolationForest (default: per model)")
+    parser.add_argument('--publish', action='store_true',
+                        help="Replace the .pkl loaded by the API with the selected model")
+    args = parser.parse_args(argv)
+
+    if args.folds < 2 or args.jobs <= 0:
+        parser.error("--folds must be at least 2 and --jobs must be positive")
+
+    try:
+        artifact, metrics = train(args.model, data=args.data, candidates=args.candidates, n_folds=args.folds,
+                                  jobs=args.jobs, outlier_filter=args.outlier_filter, publish=args.publish)
+    except ValueError as e:
+        parser.exit(1, f"error: {e}\n")
+    for name, result in sorted(metrics["candidates"].items(), key=lambda item: item[1]["cv_mse"]):
+        print(f"{name:<20} cv_mse={result['cv_mse']:.4g} (±{result['cv_mse_std']:.3g}) cv_r2={result['cv_r2']:.4f} "
+              f"holdout_mse={result['holdout']['mse']:.4g} holdout_r2={result['holdout']['r2']:.4f}")
+    print(f"Selected {metrics['selected']} ({metrics['train_seconds']:.1f}s) -> {artifact}"
+          + (f" (published to {model_paths[args.model]})" if args.publish else ""))
+
+
+if __name__ == '__main__':
+    main()